@@ -3,12 +3,17 @@ Background task processing for async model generation.
 """
 import asyncio
 import logging
+import time
 from typing import Dict, Any
 
 logger = logging.getLogger("uvicorn.error")
 
 # Store background tasks
 _background_tasks: Dict[str, asyncio.Task] = {}
+# Task IDs cancelled via cancel_background_task -> cancel time (time.monotonic()).
+# Status lookups must not restart their processing; entries expire after CANCELLED_TASK_TTL.
+CANCELLED_TASK_TTL = 24 * 3600  # seconds
+_cancelled_tasks: Dict[str, float] = {}
 
 
 async def process_image_to_3d_background(
@@ -42,6 +47,9 @@ async def process_image_to_3d_background(
         )
         logger.info("[BackgroundTask] Completed for task_id=%s", task_id)
         return result
+    except asyncio.CancelledError:
+        logger.info("[BackgroundTask] Cancelled task_id=%s", task_id)
+        raise
     except Exception as e:
         logger.error("[BackgroundTask] Failed for task_id=%s: %s", task_id, str(e))
         raise
@@ -82,6 +90,9 @@ async def process_text_to_3d_background(
         )
         logger.info("[BackgroundTask] Completed text-to-3d for task_id=%s", preview_task_id)
         return result
+    except asyncio.CancelledError:
+        logger.info("[BackgroundTask] Cancelled task_id=%s", preview_task_id)
+        raise
     except Exception as e:
         import traceback
         logger.error("[BackgroundTask] Failed for task_id=%s: %s", preview_task_id, str(e))
@@ -116,3 +127,57 @@ def is_task_running(task_id: str) -> bool:
     """Check if a task is still running in background."""
     task = _background_tasks.get(task_id)
     return task is not None and not task.done()
+
+
+async def wait_for_background_task(task_id: str, timeout: float) -> bool:
+    """
+    Wait (without cancelling it) until a background task finishes or timeout elapses.
+
+    Lets status endpoints long-poll instead of clients re-polling on a fixed interval.
+
+    Returns:
+        True if no task is running for task_id (finished or never registered), False on timeout
+    """
+    task = _background_tasks.get(task_id)
+    if task is None or task.done():
+        return True
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    return bool(done)
+
+
+def cancel_background_task(task_id: str) -> bool:
+    """
+    Cancel a running background task.
+
+    The CancelledError propagates into the running step, and the Blender/CuraEngine
+    wrappers kill their subprocess on cancellation, so no orphan keeps a CPU busy.
+    The task body marks the DB record failed and sends the MQTT failure notification
+    before the cancellation finishes; the task_id is remembered for CANCELLED_TASK_TTL
+    so is_task_cancelled() lets the status endpoint skip post-processing for it.
+
+    Returns:
+        True if a running task was cancelled, False if none was running
+    """
+    task = _background_tasks.get(task_id)
+    if task is None or task.done():
+        return False
+    # 이미 취소 중이면 다시 cancel() 하지 않음 (실패 상태 기록/알림이 끊기지 않도록)
+    if not is_task_cancelled(task_id):
+        _prune_cancelled_tasks()
+        _cancelled_tasks[task_id] = time.monotonic()
+        task.cancel()
+        logger.info("[BackgroundTask] Cancel requested for task_id=%s", task_id)
+    return True
+
+
+def is_task_cancelled(task_id: str) -> bool:
+    """Check if a task was cancelled via cancel_background_task (within CANCELLED_TASK_TTL)."""
+    cancelled_at = _cancelled_tasks.get(task_id)
+    return cancelled_at is not None and time.monotonic() - cancelled_at < CANCELLED_TASK_TTL
+
+
+def _prune_cancelled_tasks() -> None:
+    """Drop cancel records older than CANCELLED_TASK_TTL so the registry stays bounded."""
+    cutoff = time.monotonic() - CANCELLED_TASK_TTL
+    for task_id in [tid for tid, cancelled_at in _cancelled_tasks.items() if cancelled_at < cutoff]:
+        del _cancelled_tasks[task_id]
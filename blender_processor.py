@@ -4,7 +4,6 @@ import asyncio
 import textwrap
 from pathlib import Path
 from typing import Tuple
-import subprocess
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -21,6 +20,7 @@ BLENDER_DECIMATE_RATIO = float(os.getenv("BLENDER_DECIMATE_RATIO", "0.15"))
 BLENDER_MAX_PART_RATIO = float(os.getenv("BLENDER_MAX_PART_RATIO", "0.05"))
 BLENDER_SOLIDIFY_THICKNESS = float(os.getenv("BLENDER_SOLIDIFY_THICKNESS", "0.4"))
 BLENDER_ENABLE_AUTO_ORIENT = os.getenv("BLENDER_ENABLE_AUTO_ORIENT", "True").lower() == "true"
+BLENDER_TIMEOUT = int(os.getenv("BLENDER_TIMEOUT", "0"))  # seconds; 0 = no limit
 
 OUTPUT_DIR_RAW = os.getenv("OUTPUT_DIR", "./output").strip()
 OUTPUT_DIR = Path(OUTPUT_DIR_RAW)
@@ -344,29 +344,33 @@ async def run_blender_process(
         str(BLENDER_ENABLE_AUTO_ORIENT).lower(),
     ]
 
-    logger.info("[Blender] Command: %s", " ".join(cmd))
-    logger.info("[Blender] Command length: %d characters", len(" ".join(cmd)))
+    if logger.isEnabledFor(logging.INFO):
+        command_line = " ".join(cmd)
+        logger.info("[Blender] Command (%d characters): %s", len(command_line), command_line)
 
     # Run Blender process
     try:
         logger.info("[Blender] Creating subprocess...")
 
-        # Use sync subprocess for Windows compatibility
-        import subprocess
-
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-
-        def run_subprocess():
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-            )
-            stdout, _ = process.communicate()
-            return process.returncode, stdout
-
-        returncode, stdout = await loop.run_in_executor(None, run_subprocess)
+        # Native asyncio subprocess (ProactorEventLoop on Windows) - no executor thread
+        # is pinned for the whole Blender run
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=BLENDER_TIMEOUT or None)
+        except asyncio.TimeoutError:
+            logger.error("[Blender] Process timed out after %ds - killing", BLENDER_TIMEOUT)
+            process.kill()
+            await process.wait()
+            return False, f"Blender timed out after {BLENDER_TIMEOUT}s"
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        returncode = process.returncode
 
         logger.info("[Blender] Process completed with return code: %d", returncode)
         logger.info("[Blender] Stdout size: %d bytes", len(stdout))
@@ -386,13 +390,17 @@ async def run_blender_process(
             logger.error("[Blender] Full output log:\n%s", log_output)
             return False, log_output
 
-        # Check if output file exists
+        # Check if output file exists (single stat call)
         logger.info("[Blender] Checking output file: %s", output_glb)
-        logger.info("[Blender] Output exists: %s", output_glb.exists())
-        if output_glb.exists():
-            logger.info("[Blender] Output size: %d bytes", output_glb.stat().st_size)
-
-        if not output_glb.exists() or output_glb.stat().st_size == 0:
+        try:
+            output_size = output_glb.stat().st_size
+        except FileNotFoundError:
+            output_size = None
+        logger.info("[Blender] Output exists: %s", output_size is not None)
+        if output_size is not None:
+            logger.info("[Blender] Output size: %d bytes", output_size)
+
+        if not output_size:
             logger.error("[Blender] Output file missing or empty")
             logger.error("[Blender] Full output log:\n%s", log_output)
             return False, log_output
@@ -409,8 +417,9 @@ async def run_blender_process(
         logger.error("[Blender] Exception type: %s", type(e).__name__)
         logger.error("[Blender] Exception message: %s", str(e))
         import traceback
-        error_msg = f"Blender execution error: {str(e)}\n{traceback.format_exc()}"
-        logger.error("[Blender] Full traceback:\n%s", traceback.format_exc())
+        tb = traceback.format_exc()
+        error_msg = f"Blender execution error: {str(e)}\n{tb}"
+        logger.error("[Blender] Full traceback:\n%s", tb)
         return False, error_msg
 
 
@@ -484,14 +493,15 @@ async def convert_glb_to_stl(glb_path: Path, stl_path: Path) -> bool:
         # 5. 바닥으로 이동 (Z=0)
         logger.info("[Trimesh] Step 4/7: Moving to ground...")
         minz = mesh.bounds[0, 2]
-        if minz != 0:
+        if abs(minz) > 1e-7:
             mesh.apply_translation((0, 0, -minz))
 
         # 6. 중심 정렬 (XY 평면)
         logger.info("[Trimesh] Step 5/7: Centering on build plate...")
         center_xy = mesh.bounds.mean(axis=0)
         center_xy[2] = 0  # Z축은 유지
-        mesh.apply_translation(-center_xy)
+        if np.abs(center_xy).max() > 1e-7:
+            mesh.apply_translation(-center_xy)
 
         # 모델 크기 확인 (변환 후 최종 크기)
         bounds = mesh.bounds  # [[min_x, min_y, min_z], [max_x, max_y, max_z]]
@@ -519,11 +529,15 @@ async def convert_glb_to_stl(glb_path: Path, stl_path: Path) -> bool:
         logger.info("[Trimesh] Step 7/7: Exporting STL...")
         mesh.export(str(stl_path), file_type='stl')
 
-        if not stl_path.exists() or stl_path.stat().st_size == 0:
+        try:
+            stl_size = stl_path.stat().st_size
+        except FileNotFoundError:
+            stl_size = 0
+        if stl_size == 0:
             logger.warning("[Trimesh] STL file missing or empty")
             return False
 
-        file_size_mb = stl_path.stat().st_size / 1024 / 1024
+        file_size_mb = stl_size / 1024 / 1024
         logger.info("[Trimesh] ✅ STL saved: %s (%.2f MB)", stl_path, file_size_mb)
         logger.info("[Trimesh] Final: %d vertices, %d faces", len(mesh.vertices), len(mesh.faces))
         logger.info("[Trimesh] Watertight: %s, Volume: %.2f mm³", is_watertight, volume)
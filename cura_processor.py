@@ -1,11 +1,37 @@
 import os
+import re
+import math
 import logging
 import asyncio
-import subprocess
 import json
+import hashlib
+import tempfile
+import functools
+import shlex
+import shutil
+import signal
+import subprocess
+import contextlib
+import traceback
+from itertools import chain, cycle
 from pathlib import Path
 import time
-from typing import Optional, Tuple, Dict
+import threading
+from types import MappingProxyType
+import numpy as np
+from typing import Optional, Tuple, Dict, List, Mapping, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -13,17 +39,95 @@ logger = logging.getLogger("uvicorn.error")
 CURAENGINE_PATH = os.getenv("CURAENGINE_PATH", "").strip()
 CURA_DEFINITION_JSON = os.getenv("CURA_DEFINITION_JSON", "").strip()
 CURA_TIMEOUT = int(os.getenv("CURA_TIMEOUT", "300"))  # 5 minutes default
-CURA_VERBOSE = os.getenv("CURA_VERBOSE", "true").lower() == "true"
+# -v makes CuraEngine log every layer (MBs of stdout to drain); opt-in for debugging only
+CURA_VERBOSE = os.getenv("CURA_VERBOSE", "false").lower() == "true"
+CURA_LOG_TAIL_BYTES = int(os.getenv("CURA_LOG_TAIL_BYTES", str(256 * 1024)))  # log tail kept in memory
+# stdout pipe read size: 64 KiB matches the Linux pipe buffer; smaller on Windows (IOCP pipe reads)
+CURA_READ_CHUNK = 16 * 1024 if os.name == "nt" else 64 * 1024
+CURA_LOG_BUFFER = 1024 * 1024  # log file write buffer (coalesces ~16 pipe reads per write)
+CURA_STREAM_LIMIT = 1024 * 1024  # asyncio StreamReader buffer limit
+# Default: half the cores - each CuraEngine runs several worker threads and is memory-hungry
+CURA_MAX_CONCURRENCY = int(os.getenv("CURA_MAX_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))))
+# Pin each CuraEngine to one CPU (round-robin). Off by default: CuraEngine itself is multi-threaded.
+CURA_PIN_CPUS = os.getenv("CURA_PIN_CPUS", "false").lower() == "true"
 
 OUTPUT_DIR_RAW = os.getenv("OUTPUT_DIR", "./output").strip()
-OUTPUT_DIR = Path(OUTPUT_DIR_RAW)
+OUTPUT_DIR = Path(OUTPUT_DIR_RAW).absolute()
+# Content-addressed G-code cache (STL bytes + definition + settings); 0 disables
+CURA_SLICE_CACHE_MAX = int(os.getenv("CURA_SLICE_CACHE_MAX", "200"))
+CURA_SLICE_CACHE_DIR = OUTPUT_DIR / "slice_cache"
+# Entries allowed above CURA_SLICE_CACHE_MAX before an eviction scan (amortises scandir + sort)
+CURA_SLICE_CACHE_SLACK = max(1, CURA_SLICE_CACHE_MAX // 10)
+
+# Resolved once at import - these paths do not change for the process lifetime
+_CURAENGINE_ABS = str(Path(CURAENGINE_PATH).resolve()) if CURAENGINE_PATH else ""
+
+# Cura definitions directory
+# CURAENGINE_PATH = C:\Program Files\UltiMaker Cura 5.7.1\CuraEngine.exe
+# CURA_DEFINITIONS_DIR = C:\Program Files\UltiMaker Cura 5.7.1\share\cura\resources\definitions
+CURA_DEFINITIONS_DIR = Path(CURAENGINE_PATH).parent / "share" / "cura" / "resources" / "definitions"
+# Where CuraEngine looks up inherited/extruder definitions besides the referencing file's directory
+_DEFINITION_SEARCH_DIRS = tuple(
+    str(Path(base) / sub)
+    for base in os.getenv("CURA_ENGINE_SEARCH_PATH", "").split(os.pathsep) if base
+    for sub in ("", "definitions", "extruders")
+) + (str(CURA_DEFINITIONS_DIR), str(CURA_DEFINITIONS_DIR.parent / "extruders"))
 
 logger.info(
-    "[CuraCfg] path=%s definition=%s timeout=%ds verbose=%s",
+    "[CuraCfg] path=%s definition=%s timeout=%ds verbose=%s max_concurrency=%d",
     CURAENGINE_PATH or "(not configured)",
     CURA_DEFINITION_JSON or "(not configured)",
     CURA_TIMEOUT,
     CURA_VERBOSE,
+    CURA_MAX_CONCURRENCY,
+)
+
+# CuraEngine log parsing
+CURA_STATS_SCAN_BYTES = 64 * 1024
+_SLICING_STATS_RE = re.compile(
+    rb'Processing insets for layer \d+ of (?P<layer_count>\d+)'
+    rb'|\[info\] Progress:.*?(?P<stage>slice|export) accomplished in (?P<seconds>[\d.]+)s'
+)
+_ERROR_MARKER = b"[error]"
+CURA_ERROR_SUMMARY_LINES = 10
+
+# G-code parsing (compiled once - these run per line of multi-MB files)
+_GCODE_S_PARAM_RE = re.compile(r'S([\d.]+)')
+_GCODE_TIME_RE = re.compile(r';TIME:(\d+)')
+_GCODE_METERS_RE = re.compile(r'([\d.]+)\s*m\b', re.IGNORECASE)
+_GCODE_GRAMS_RE = re.compile(r'([\d.]+)\s*g\b', re.IGNORECASE)
+_GCODE_BRACKET_NUMBER_RE = re.compile(r'\[([\d.]+)\]')
+_GCODE_NUMBER_RE = re.compile(r'([\d.]+)')
+_GCODE_INT_RE = re.compile(r'(\d+)')
+_GCODE_MATERIAL_RE = re.compile(r';MATERIAL2?:([\d.]+)')
+_GCODE_LAYER_COUNT_RE = re.compile(r';LAYER_COUNT:(\d+)')
+_GCODE_LAYER_HEIGHT_RE = re.compile(r'height[:\s]+([\d.]+)', re.IGNORECASE)
+_GCODE_LAYER_HEIGHT_TAG_RE = re.compile(r'LAYER_HEIGHT:([\d.]+)')
+_GCODE_PRINTER_NAME_RE = re.compile(r';Printer name:\s*(.+)')
+# G1 word extraction (vectorised over raw bytes): F, E, X, Y, Z -> column 0..4
+_G1_WORDS = b'FEXYZ'
+_G1_WORD_INDEX = np.zeros(256, np.int8)
+_G1_WORD_INDEX[list(_G1_WORDS)] = np.arange(1, len(_G1_WORDS) + 1)
+_G1_NUMBER_CHARS = np.zeros(256, bool)
+_G1_NUMBER_CHARS[list(b'0123456789.-')] = True
+CURA_GCODE_SCAN_CHUNK = 8 * 1024 * 1024  # bytes of G-code parsed per vectorised batch
+CURA_GCODE_READ_BUFFER = 1024 * 1024  # line-by-line metadata scan read buffer (default is 8 KiB)
+
+# 필라멘트 길이/무게 환산 (1.75mm 필라멘트, PLA 1.24 g/cm³ 가정)
+FILAMENT_DIAMETER_MM = 1.75
+FILAMENT_AREA_MM2 = math.pi * (FILAMENT_DIAMETER_MM / 2.0) ** 2
+PLA_DENSITY_G_PER_CM3 = 1.24
+
+# DB-supplied definition hashes become part of a file name - hex only
+_DEFINITION_DIGEST_RE = re.compile(r'[0-9a-f]{16,128}')
+
+# Caps concurrent CuraEngine processes (CPU-heavy; more than cores just thrashes)
+# (이벤트 루프에 묶이지 않도록 첫 사용 시점에 생성)
+_SLICE_SEM: Optional[asyncio.Semaphore] = None
+_slice_waiting = 0  # slices queued behind _SLICE_SEM
+_CPU_ROTATOR = (
+    cycle(sorted(os.sched_getaffinity(0)))
+    if CURA_PIN_CPUS and hasattr(os, "sched_setaffinity") else None
 )
 
 
@@ -122,23 +226,311 @@ DEFAULT_CURA_SETTINGS = {
 }
 
 
-def is_curaengine_available() -> bool:
-    """Check if CuraEngine is available and configured."""
+_DEFAULT_CURA_SETTINGS_VIEW = MappingProxyType(DEFAULT_CURA_SETTINGS)
+
+
+@functools.lru_cache(maxsize=32)
+def is_curaengine_available(definition_json: Optional[str] = None) -> bool:
+    """
+    Check if CuraEngine is available and configured (cached per definition path).
+
+    Args:
+        definition_json: Printer definition to check (defaults to CURA_DEFINITION_JSON)
+    """
     if not CURAENGINE_PATH:
         logger.warning("[Cura] CURAENGINE_PATH not configured")
         return False
-    if not Path(CURAENGINE_PATH).exists():
+    if not Path(_CURAENGINE_ABS).exists():
         logger.warning("[Cura] CuraEngine not found at: %s", CURAENGINE_PATH)
         return False
-    if not CURA_DEFINITION_JSON:
+    definition_json = definition_json or CURA_DEFINITION_JSON
+    if not definition_json:
         logger.warning("[Cura] CURA_DEFINITION_JSON not configured")
         return False
-    if not Path(CURA_DEFINITION_JSON).exists():
-        logger.warning("[Cura] Printer definition not found at: %s", CURA_DEFINITION_JSON)
+    if not Path(_absolute_path(definition_json)).exists():
+        logger.warning("[Cura] Printer definition not found at: %s", definition_json)
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def _absolute_path(path: str) -> str:
+    """Memoised Path(path).resolve() for definition files reused across slices."""
+    return str(Path(path).resolve())
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_printer_def(printer_name: str) -> Path:
+    """
+    Resolve a printer name to its .def.json in CURA_DEFINITIONS_DIR (cached).
+
+    Raises:
+        FileNotFoundError: If the definition file does not exist (not cached)
+    """
+    # Remove .def if already in printer_name
+    if printer_name.endswith(".def"):
+        printer_name = printer_name[:-4]
+    return (CURA_DEFINITIONS_DIR / f"{printer_name}.def.json").resolve(strict=True)
+
+
+def _definition_defaults(definition_path: str) -> Dict[str, str]:
+    """
+    Flat {key: str(default_value)} map of a printer definition's overrides.
+
+    Used to drop -s arguments that would only restate the definition's own value.
+    Every -s follows -e0 and so is set at extruder scope; keys the extruder chain
+    defines (extruder overrides, fdmextruder settings) would win over the global
+    override once the -s is dropped, so they are never listed here.
+    Cached per file version (path, mtime), so an edited definition is re-read.
+    Unreadable definitions yield an empty map (nothing is filtered).
+    """
+    try:
+        printer_chain, extruder_chain, _ = _definition_files(definition_path)
+    except OSError as e:
+        logger.warning("[Cura] Could not read definition defaults from %s: %s", definition_path, e)
+        return {}
+    _, mtime_ns, _, _ = printer_chain[0]
+    extruder_files = tuple((path, mtime) for path, mtime, _, _ in extruder_chain)
+    return _definition_defaults_at(definition_path, mtime_ns, extruder_files)
+
+
+@functools.lru_cache(maxsize=32)
+def _definition_defaults_at(
+    definition_path: str, mtime_ns: int, extruder_files: Tuple[Tuple[str, int], ...]
+) -> Dict[str, str]:
+    shadowed = set()
+    for path, mtime in extruder_files:
+        shadowed.update(_definition_keys(_load_definition_at(path, mtime)))
+    data = _load_definition_at(definition_path, mtime_ns)
+    defaults = {}
+    for key, value in (data.get("overrides") or {}).items():
+        if key not in shadowed and isinstance(value, dict) and "default_value" in value:
+            defaults[key] = str(value["default_value"])
+    return defaults
+
+
+def _definition_keys(data: Dict[str, any]) -> set:
+    """Setting keys a definition declares or overrides (settings walked through children)."""
+    keys = set(data.get("overrides") or ())
+    stack = [data.get("settings") or {}]
+    while stack:
+        for key, setting in stack.pop().items():
+            keys.add(key)
+            if isinstance(setting, dict) and isinstance(setting.get("children"), dict):
+                stack.append(setting["children"])
+    return keys
+
+
+@functools.lru_cache(maxsize=64)
+def _load_definition_at(definition_path: str, mtime_ns: int) -> Dict[str, any]:
+    """Parsed .def.json (cached per file version); {} when unreadable."""
+    try:
+        raw = Path(definition_path).read_bytes()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except (OSError, ValueError) as e:
+        logger.warning("[Cura] Could not read definition %s: %s", definition_path, e)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _find_definition(name: str, referencing_dir: str) -> Optional[str]:
+    """Locate <name>.def.json like CuraEngine: next to the referencing file, then the search path."""
+    for directory in (referencing_dir, *_DEFINITION_SEARCH_DIRS):
+        candidate = os.path.join(directory, f"{name}.def.json")
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _inherits_chain(definition_path: str, missing: List[str]) -> List[Tuple[str, int, int, Dict[str, any]]]:
+    """(path, mtime_ns, size, data) for a definition and each parent it inherits from."""
+    chain = []
+    seen = set()
+    path = definition_path
+    while path is not None and path not in seen:
+        seen.add(path)
+        st = os.stat(path)
+        data = _load_definition_at(path, st.st_mtime_ns)
+        chain.append((path, st.st_mtime_ns, st.st_size, data))
+        parent = data.get("inherits")
+        path = _find_definition(parent, os.path.dirname(path)) if parent else None
+        if parent and path is None:
+            missing.append(parent)
+    return chain
+
+
+def _definition_files(definition_abs: str) -> Tuple[list, list, List[str]]:
+    """
+    Every definition file CuraEngine reads for definition_abs.
+
+    Returns:
+        (printer chain, extruder-train chains, names that could not be found);
+        chain entries are (path, mtime_ns, size, data), child before parent
+    """
+    missing: List[str] = []
+    printer_chain = _inherits_chain(definition_abs, missing)
+    # 자식 정의가 부모의 machine_extruder_trains 를 덮어씀
+    trains = next(
+        (data["metadata"]["machine_extruder_trains"] for _, _, _, data in printer_chain
+         if isinstance(data.get("metadata"), dict) and data["metadata"].get("machine_extruder_trains")),
+        {},
+    )
+    extruder_chain = []
+    for _, name in sorted(trains.items()):
+        path = _find_definition(name, os.path.dirname(definition_abs))
+        if path is None:
+            missing.append(name)
+        else:
+            extruder_chain.extend(_inherits_chain(path, missing))
+    return printer_chain, extruder_chain, missing
+
+
+def reset_cura_availability_cache() -> None:
+    """Forget cached availability/path lookups (e.g. after installing CuraEngine or definitions)."""
+    is_curaengine_available.cache_clear()
+    _absolute_path.cache_clear()
+    _resolve_printer_def.cache_clear()
+    _definition_defaults_at.cache_clear()
+    _load_definition_at.cache_clear()
+
+
+def _spawn_kwargs() -> Dict[str, any]:
+    """Start CuraEngine in its own process group so a timeout kill takes its children too."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    # No preexec_fn / pass_fds / shell: keeps CPython on its vfork() spawn path,
+    # so the server's address space is not copied per slice. (start_new_session
+    # rules out posix_spawn, but setsid() is done in the vfork child for free.)
+    return {"start_new_session": True}
+
+
+def _pin_to_next_cpu(pid: int) -> None:
+    """Round-robin CPU pinning for a freshly spawned CuraEngine (only with CURA_PIN_CPUS)."""
+    if _CPU_ROTATOR is None:
+        return
+    try:
+        os.sched_setaffinity(pid, {next(_CPU_ROTATOR)})
+    except OSError as e:
+        logger.warning("[Cura] Failed to set CPU affinity for pid %d: %s", pid, e)
+
+
+def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+    """Kill CuraEngine and anything it spawned."""
+    if os.name == "nt":
+        process.kill()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def get_slice_queue_depth() -> int:
+    """Number of slices currently waiting for a free CuraEngine slot."""
+    return _slice_waiting
+
+
+@contextlib.asynccontextmanager
+async def _slice_slot():
+    """Acquire one of CURA_MAX_CONCURRENCY CuraEngine slots, tracking the queue depth."""
+    global _SLICE_SEM, _slice_waiting
+    if _SLICE_SEM is None:
+        _SLICE_SEM = asyncio.Semaphore(CURA_MAX_CONCURRENCY)
+    _slice_waiting += 1
+    if _SLICE_SEM.locked():
+        logger.info("[Cura] All %d slicer slots busy, queued (depth=%d)", CURA_MAX_CONCURRENCY, _slice_waiting)
+    try:
+        await _SLICE_SEM.acquire()
+    finally:
+        _slice_waiting -= 1
+    try:
+        yield
+    finally:
+        _SLICE_SEM.release()
+
+
+def _slice_cache_key(stl_abs: str, definition_abs: str, slice_settings) -> str:
+    """
+    Hash everything that determines the G-code: STL bytes, the CuraEngine binary, the
+    definition with its inherited parents and extruder trains, and the settings.
+
+    Binary and definition files enter by (path, mtime_ns, size), so an in-place
+    CuraEngine upgrade or an edited fdmprinter/fdmextruder yields new keys.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(stl_abs, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    st = os.stat(_CURAENGINE_ABS)
+    digest.update(f"\0{_CURAENGINE_ABS}\0{st.st_mtime_ns}\0{st.st_size}".encode())
+    printer_chain, extruder_chain, missing = _definition_files(definition_abs)
+    for path, mtime_ns, size, _ in chain(printer_chain, extruder_chain):
+        digest.update(f"\0{path}\0{mtime_ns}\0{size}".encode())
+    for name in missing:
+        digest.update(f"\0missing:{name}".encode())
+    for key, value in sorted(slice_settings):
+        digest.update(f"\0{key}={value}".encode())
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link src to dst (atomically replacing dst); copy where links are unsupported."""
+    temp_path = f"{dst}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    try:
+        os.link(src, temp_path)
+    except OSError:
+        shutil.copyfile(src, temp_path)
+    try:
+        os.replace(temp_path, dst)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def _restore_from_slice_cache(cache_path: Path, gcode_abs: str, log_path: Path) -> bool:
+    """Link a cached G-code to gcode_abs; False when the entry is missing (or was just evicted)."""
+    try:
+        _link_or_copy(str(cache_path), gcode_abs)
+    except FileNotFoundError:
         return False
+    os.utime(gcode_abs)  # shared inode: also marks the cache entry as recently used
+    log_path.write_text(f"Reused cached G-code {cache_path.stem}\n", encoding="utf-8")
     return True
 
 
+_slice_cache_lock = threading.Lock()  # stores run in worker threads
+_slice_cache_count: Optional[int] = None  # entries in CURA_SLICE_CACHE_DIR (counted on first store)
+
+
+def _store_in_slice_cache(gcode_abs: str, cache_path: Path) -> None:
+    """
+    Publish a finished G-code into the slice cache.
+
+    The entry count is tracked in memory; the directory is only scanned (and the
+    least recently used entries evicted down to CURA_SLICE_CACHE_MAX) once the
+    count exceeds the limit by CURA_SLICE_CACHE_SLACK.
+    """
+    global _slice_cache_count
+    try:
+        CURA_SLICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        is_new = not cache_path.exists()
+        _link_or_copy(gcode_abs, str(cache_path))
+        with _slice_cache_lock:
+            if _slice_cache_count is None:
+                _slice_cache_count = sum(1 for _ in os.scandir(CURA_SLICE_CACHE_DIR))
+            elif is_new:
+                _slice_cache_count += 1
+            if _slice_cache_count <= CURA_SLICE_CACHE_MAX + CURA_SLICE_CACHE_SLACK:
+                return
+            entries = list(os.scandir(CURA_SLICE_CACHE_DIR))
+            entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+            for entry in entries[:-CURA_SLICE_CACHE_MAX]:
+                Path(entry.path).unlink(missing_ok=True)
+            _slice_cache_count = min(len(entries), CURA_SLICE_CACHE_MAX)
+    except OSError as e:
+        logger.warning("[Cura] Failed to store G-code in slice cache: %s", e)
+
+
 def get_default_printer_name() -> str:
     """
     Extract printer name from CURA_DEFINITION_JSON path.
@@ -162,32 +554,36 @@ def get_default_printer_name() -> str:
         return "fdmprinter"
 
 
-def merge_settings(custom_settings: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+def merge_settings(custom_settings: Optional[Dict[str, str]] = None) -> Mapping[str, str]:
     """
     Merge custom settings with default settings.
 
+    Without custom settings the shared defaults are returned as a read-only
+    view (no copy); otherwise a single C-level dict merge is done.
+
     Args:
         custom_settings: User-provided settings to override defaults
 
     Returns:
-        Merged settings dictionary
+        Merged settings mapping
     """
-    merged = DEFAULT_CURA_SETTINGS.copy()
+    if not custom_settings:
+        return _DEFAULT_CURA_SETTINGS_VIEW
 
-    if custom_settings:
-        # Validate and merge custom settings
-        for key, value in custom_settings.items():
-            # Convert all values to strings (CuraEngine requirement)
-            merged[key] = str(value)
-            logger.info("[Cura] Custom setting: %s=%s", key, value)
+    # Convert all values to strings (CuraEngine requirement)
+    overrides = {key: str(value) for key, value in custom_settings.items()}
+    if logger.isEnabledFor(logging.DEBUG):
+        for key, value in overrides.items():
+            logger.debug("[Cura] Custom setting: %s=%s", key, value)
 
-    return merged
+    return {**DEFAULT_CURA_SETTINGS, **overrides}
 
 
 async def run_curaengine_process(
     stl_path: Path,
     gcode_path: Path,
-    settings: Dict[str, str],
+    settings: Mapping[str, str],
+    definition_json: Optional[str] = None,
 ) -> Tuple[bool, str]:
     """
     Run CuraEngine to slice STL to G-code.
@@ -196,19 +592,16 @@ async def run_curaengine_process(
         stl_path: Path to input STL file
         gcode_path: Path to output G-code file
         settings: Dictionary of Cura settings
+        definition_json: Printer definition JSON path (defaults to CURA_DEFINITION_JSON)
 
     Returns:
-        Tuple[success: bool, log_output: str]
+        Tuple[success: bool, log_path_or_error: str]
+        (성공 시 로그 파일 경로, 실패 시 에러 요약. 전체 로그는 OUTPUT_DIR/cura_log_<stem>.txt 에 스트리밍 저장)
     """
     start_time = time.time()
+    definition_json = definition_json or CURA_DEFINITION_JSON
 
-    logger.info("[Cura] ===== Starting CuraEngine Slicing =====")
-    logger.info("[Cura] Input STL: %s (exists: %s)", stl_path, stl_path.exists())
-    logger.info("[Cura] Output G-code: %s", gcode_path)
-    logger.info("[Cura] Printer definition: %s", CURA_DEFINITION_JSON)
-    logger.info("[Cura] Settings count: %d", len(settings))
-
-    if not is_curaengine_available():
+    if not is_curaengine_available(definition_json):
         logger.error("[Cura] CuraEngine not available")
         return False, "CuraEngine not configured or not found"
 
@@ -217,73 +610,119 @@ async def run_curaengine_process(
         return False, f"STL file not found: {stl_path}"
 
     # Prepare log file
-    log_path = OUTPUT_DIR / f"cura_log_{gcode_path.stem}.txt"
-    logger.info("[Cura] Log will be saved to: %s", log_path)
+    stem = gcode_path.stem
+    log_path = OUTPUT_DIR / f"cura_log_{stem}.txt"
+
+    # Callers normally pass absolute paths (OUTPUT_DIR is absolutised at import);
+    # only fall back to absolute() - a getcwd() syscall - for relative ones
+    stl_abs = str(stl_path if stl_path.is_absolute() else stl_path.absolute())
+    gcode_abs = str(gcode_path if gcode_path.is_absolute() else gcode_path.absolute())
+
+    # Skip settings the printer definition already carries with the same value
+    definition_abs = _absolute_path(definition_json)
+    definition_defaults = _definition_defaults(definition_abs)
+    slice_settings = [
+        (key, value) for key, value in settings.items()
+        if definition_defaults.get(key) != value
+    ]
+
+    # Identical STL + definition + settings -> reuse the G-code of an earlier slice
+    cache_path = None
+    if CURA_SLICE_CACHE_MAX > 0:
+        try:
+            cache_key = await asyncio.to_thread(_slice_cache_key, stl_abs, definition_abs, slice_settings)
+            cache_path = CURA_SLICE_CACHE_DIR / f"{cache_key}.gcode"
+            if await asyncio.to_thread(_restore_from_slice_cache, cache_path, gcode_abs, log_path):
+                logger.info("[Cura] Slice cache hit: %s -> %s", cache_key, gcode_abs)
+                return True, str(log_path)
+        except OSError as e:
+            logger.warning("[Cura] Slice cache unavailable: %s", e)
+            cache_path = None
+
+    # CuraEngine rewrites its -o file in place. Write to a fresh temp file and os.replace it
+    # onto gcode_abs, so an existing output that shares its inode with a cache entry is
+    # never overwritten (and an older output can't make a failed slice look successful).
+    part_abs = f"{gcode_abs}.{os.getpid()}.{time.monotonic_ns()}.part"
 
     # Build CuraEngine command
+    # slice [-v] -j <definition> -o <output> -e0 (-s key=value)* -l <stl>  (input STL must be last)
     cmd = [
-        str(CURAENGINE_PATH),
-        "slice",
+        _CURAENGINE_ABS, "slice",
+        *(("-v",) if CURA_VERBOSE else ()),
+        "-j", definition_abs,
+        "-o", part_abs,
+        "-e0",
+        *chain.from_iterable(("-s", f"{key}={value}") for key, value in slice_settings),
+        "-l", stl_abs,
     ]
 
-    # Add verbose flag if enabled
-    if CURA_VERBOSE:
-        cmd.append("-v")
-
-    # Add printer definition
-    cmd.extend(["-j", str(Path(CURA_DEFINITION_JSON).absolute())])
-
-    # Add output file
-    cmd.extend(["-o", str(gcode_path.absolute())])
-
-    # Add extruder (extruder 0)
-    cmd.append("-e0")
-
-    # Add all settings as -s key=value pairs
-    for key, value in settings.items():
-        cmd.extend(["-s", f"{key}={value}"])
-
-    # Add input STL file (must be last)
-    cmd.extend(["-l", str(stl_path.absolute())])
-
-    logger.info("[Cura] Command length: %d arguments", len(cmd))
-    if CURA_VERBOSE:
-        logger.info("[Cura] Full command: %s", " ".join(cmd))
+    # One structured start record instead of a line per field
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "[Cura] Slice start: stl=%s out=%s definition=%s settings=%d args=%d timeout=%ds log=%s",
+            stl_abs, gcode_abs, definition_json, len(slice_settings), len(cmd), CURA_TIMEOUT, log_path,
+            extra={
+                "stl": stl_abs,
+                "out": gcode_abs,
+                "definition": definition_json,
+                "settings_n": len(slice_settings),
+            },
+        )
+        if CURA_VERBOSE:
+            logger.info("[Cura] Full command: %s", shlex.join(cmd))
 
     # Run CuraEngine process
     try:
-        logger.info("[Cura] Starting subprocess with timeout=%ds...", CURA_TIMEOUT)
-
-        # Use sync subprocess for Windows compatibility
-        loop = asyncio.get_event_loop()
-
-        def run_subprocess():
-            try:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                )
-                stdout, _ = process.communicate(timeout=CURA_TIMEOUT)
-                return process.returncode, stdout
-            except subprocess.TimeoutExpired:
-                process.kill()
-                return -1, b"Process timed out"
-
-        returncode, stdout = await loop.run_in_executor(None, run_subprocess)
-
-        logger.info("[Cura] Process completed with return code: %d", returncode)
-        logger.info("[Cura] Stdout size: %d bytes", len(stdout))
-
-        log_output = stdout.decode("utf-8", errors="ignore")
-        logger.info("[Cura] Decoded output size: %d characters", len(log_output))
+        # Stream stdout straight into the log file; only a bounded tail stays in memory.
+        # Read pipe-block sized chunks instead of lines to keep wakeups/syscalls low.
+        tail = bytearray()
+        stdout_size = 0
+
+        async def drain_stdout(process, log_file):
+            nonlocal stdout_size
+            while True:
+                chunk = await process.stdout.read(CURA_READ_CHUNK)
+                if not chunk:
+                    break
+                log_file.write(chunk)
+                stdout_size += len(chunk)
+                tail.extend(chunk)
+                if len(tail) > 2 * CURA_LOG_TAIL_BYTES:
+                    del tail[:-CURA_LOG_TAIL_BYTES]
+            return await process.wait()
+
+        async with _slice_slot():
+            # Native asyncio subprocess: no executor thread is held for the whole slice
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=CURA_STREAM_LIMIT,
+                **_spawn_kwargs(),
+            )
+            _pin_to_next_cpu(process.pid)
 
-        # Save log
-        try:
-            log_path.write_text(log_output, encoding="utf-8", errors="ignore")
-            logger.info("[Cura] Log saved successfully: %s", log_path)
-        except Exception as e:
-            logger.error("[Cura] Failed to save log: %s", str(e))
+            with open(log_path, "wb", buffering=CURA_LOG_BUFFER) as log_file:
+                try:
+                    returncode = await asyncio.wait_for(
+                        drain_stdout(process, log_file), timeout=CURA_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    _kill_process_group(process)
+                    await process.wait()
+                    returncode = -1
+                except asyncio.CancelledError:
+                    # Request cancelled: don't leave an orphaned CuraEngine running
+                    _kill_process_group(process)
+                    # 좀비 프로세스가 남지 않도록 종료를 회수 (재취소에도 보호)
+                    await asyncio.shield(process.wait())
+                    raise
+
+        logger.info("[Cura] Process completed: returncode=%d stdout=%d bytes", returncode, stdout_size)
+
+        # Keep the tail as bytes; only the parts we report are decoded
+        log_tail = bytes(tail[-CURA_LOG_TAIL_BYTES:])
+        del tail
 
         # Check for timeout
         if returncode == -1:
@@ -291,33 +730,37 @@ async def run_curaengine_process(
             return False, "Slicing timeout"
 
         # CuraEngine may return non-zero even on success (due to warnings)
-        # Check if G-code file was actually created
-        logger.info("[Cura] Checking output file: %s", gcode_path)
-        logger.info("[Cura] Output exists: %s", gcode_path.exists())
-
-        if gcode_path.exists():
-            file_size = gcode_path.stat().st_size
-            logger.info("[Cura] Output size: %d bytes (%.2f KB)", file_size, file_size / 1024)
+        # Check if G-code file was actually created (single stat call)
+        try:
+            file_size = os.stat(part_abs).st_size
+        except FileNotFoundError:
+            file_size = None
 
+        if file_size is not None:
             if file_size == 0:
                 logger.error("[Cura] G-code file is empty")
                 return False, "Generated G-code file is empty"
 
-            # Parse slicing statistics from log
-            stats = parse_slicing_stats(log_output)
-            logger.info("[Cura] Slicing stats: %s", stats)
-
-            
-            elapsed_time = time.time() - start_time
-            logger.info("[Cura] Total slicing time: %.2f seconds (%.1f minutes)", elapsed_time, elapsed_time / 60.0)
-
-            logger.info("[Cura] ===== Slicing Successful =====")
-            return True, log_output
+            if logger.isEnabledFor(logging.INFO):
+                # Parse slicing statistics from log (only used for this record)
+                stats = parse_slicing_stats(log_tail)
+                elapsed_time = time.time() - start_time
+                logger.info(
+                    "[Cura] Slicing successful: output=%d bytes (%.2f KB) time=%.2fs stats=%s",
+                    file_size, file_size / 1024, elapsed_time, stats,
+                    extra={"out": gcode_abs, "size": file_size, "elapsed": elapsed_time, "stats": stats},
+                )
+            os.replace(part_abs, gcode_abs)
+            if cache_path is not None:
+                await asyncio.to_thread(_store_in_slice_cache, gcode_abs, cache_path)
+            return True, str(log_path)
         else:
             logger.error("[Cura] G-code file not generated")
             # Extract error messages from log
-            error_lines = [line for line in log_output.split('\n') if '[error]' in line.lower()]
-            error_summary = '\n'.join(error_lines[-10:]) if error_lines else log_output[-500:]
+            error_lines = _last_error_lines(log_tail)
+            error_summary = (b"\n".join(error_lines) if error_lines else log_tail[-500:]).decode(
+                "utf-8", errors="ignore"
+            )
             logger.error("[Cura] Error summary:\n%s", error_summary)
             return False, error_summary
 
@@ -328,61 +771,226 @@ async def run_curaengine_process(
         logger.error("[Cura] Exception during subprocess execution")
         logger.error("[Cura] Exception type: %s", type(e).__name__)
         logger.error("[Cura] Exception message: %s", str(e))
-        import traceback
-        error_msg = f"CuraEngine execution error: {str(e)}\n{traceback.format_exc()}"
-        logger.error("[Cura] Full traceback:\n%s", traceback.format_exc())
+        tb = traceback.format_exc()
+        error_msg = f"CuraEngine execution error: {str(e)}\n{tb}"
+        logger.error("[Cura] Full traceback:\n%s", tb)
         return False, error_msg
+    finally:
+        Path(part_abs).unlink(missing_ok=True)
 
 
-def parse_slicing_stats(log_output: str) -> Dict[str, any]:
+def _last_error_lines(log: bytes, limit: int = CURA_ERROR_SUMMARY_LINES) -> List[bytes]:
+    """
+    Return up to `limit` trailing CuraEngine "[error]" lines, oldest first.
+
+    Scans backwards with rfind so only the lines actually reported are
+    sliced out; the rest of the log is never split or decoded.
+    """
+    lines = []
+    end = len(log)
+    while len(lines) < limit:
+        pos = log.rfind(_ERROR_MARKER, 0, end)
+        if pos < 0:
+            break
+        start = log.rfind(b"\n", 0, pos) + 1
+        stop = log.find(b"\n", pos)
+        if stop < 0:
+            stop = len(log)
+        lines.append(log[start:stop].rstrip(b"\r"))
+        end = start
+    lines.reverse()
+    return lines
+
+
+def parse_slicing_stats(log_output: Union[bytes, str]) -> Dict[str, any]:
     """
     Parse useful statistics from CuraEngine log output.
 
+    Only the last CURA_STATS_SCAN_BYTES bytes are scanned; the summary
+    lines we need are printed at the end of the slice. Raw bytes are parsed
+    directly, without decoding.
+
     Args:
-        log_output: Full log output from CuraEngine
+        log_output: CuraEngine log output (or its tail), bytes or str
 
     Returns:
         Dictionary with statistics (layer_count, print_time, etc.)
     """
-    import re
     stats = {}
 
     try:
-        lines = log_output.split('\n')
-
-        for line in lines:
-            # Parse layer count
-            if 'Processing insets for layer' in line:
-                match = re.search(r'layer \d+ of (\d+)', line)
-                if match:
-                    stats['layer_count'] = int(match.group(1))
-
-            # Parse progress messages
-            if '[info] Progress:' in line and 'accomplished in' in line:
-                # Extract timing information
-                if 'slice accomplished' in line:
-                    match = re.search(r'in ([\d.]+)s', line)
-                    if match:
-                        stats['slice_time'] = float(match.group(1))
-                elif 'export accomplished' in line:
-                    match = re.search(r'in ([\d.]+)s', line)
-                    if match:
-                        stats['export_time'] = float(match.group(1))
+        if isinstance(log_output, str):
+            log_output = log_output.encode("utf-8", errors="ignore")
+        # Single pass over the bytes; no per-line list is materialised
+        for match in _SLICING_STATS_RE.finditer(log_output, max(0, len(log_output) - CURA_STATS_SCAN_BYTES)):
+            if match.lastgroup == 'layer_count':
+                stats['layer_count'] = int(match.group('layer_count'))
+            else:
+                # slice_time / export_time
+                stats[f"{match.group('stage').decode()}_time"] = float(match.group('seconds'))
     except Exception as e:
         logger.warning("[Cura] Failed to parse statistics: %s", str(e))
 
     return stats
 
 
+def _advise_sequential(f) -> None:
+    """Hint the kernel to read ahead aggressively for a front-to-back G-code scan (POSIX only)."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _forward_fill(values: np.ndarray, initial: float) -> np.ndarray:
+    """Replace NaNs with the last seen value (`initial` before the first one)."""
+    values = np.concatenate(([initial], values))
+    idx = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx][1:]
+
+
+def _parse_decimal_runs(buf: np.ndarray, begin: np.ndarray, end: np.ndarray, signed: bool = True) -> np.ndarray:
+    """
+    Parse the decimal numbers buf[begin[i]:end[i]] (e.g. b"-12.5") column by column.
+
+    Runs of at most 15 digits with one optional '.' and a leading '-' are
+    accumulated into an exact int64 mantissa (< 2**53) and divided once by an
+    exact power of ten, which rounds to the same double as float(). Anything
+    else - longer digit runs, a second '.', an inner '-', no digits - goes
+    through float() itself, so malformed words raise ValueError as before.
+    With signed=False (F) the run ends at the first '-', like r'F([\d.]+)'.
+    """
+    n = len(begin)
+    mantissa = np.zeros(n, np.int64)
+    frac_digits = np.zeros(n, np.int64)
+    digits = np.zeros(n, np.int64)
+    dots = np.zeros(n, np.int64)
+    inner_minus = np.zeros(n, bool)
+    width = int((end - begin).max()) if n else 0
+    for j in range(width):
+        live = begin + j < end
+        ch = buf[np.where(live, begin + j, 0)]
+        digit = live & (ch >= 48) & (ch <= 57)
+        mantissa = np.where(digit, mantissa * 10 + (ch - 48), mantissa)
+        frac_digits += digit & (dots > 0)
+        digits += digit
+        dots += live & (ch == 46)  # '.'
+        if j:
+            inner_minus |= live & (ch == 45)  # '-'
+    value = mantissa / 10.0 ** frac_digits
+    if n:
+        value = np.where(buf[begin] == 45, -value, value)
+    # 정수 가수로 정확히 표현되지 않거나 형식이 이상한 값은 float() 로 처리
+    for i in np.flatnonzero((digits == 0) | (digits > 15) | (dots > 1) | inner_minus):
+        text = buf[begin[i]:end[i]].tobytes()
+        value[i] = float(text if signed else text.split(b'-', 1)[0])
+    return value
+
+
+def _g1_word_columns(chunk: bytes) -> np.ndarray:
+    r"""
+    Extract the F, E, X, Y, Z words of every "G1 " line in a block of whole lines.
+
+    Like a per-line re.search(r'X([\d.\-]+)'), the first occurrence of each
+    letter followed by a number is used (F takes no sign).
+
+    Returns:
+        float64 array of shape (5, number of G1 lines); NaN where a word is absent
+    """
+    buf = np.frombuffer(chunk, np.uint8)
+    size = len(buf)
+    line_starts = np.flatnonzero(buf == 10) + 1
+    line_starts = np.concatenate(([0], line_starts[line_starts < size]))
+    head = line_starts[line_starts + 3 <= size]
+    is_g1 = np.zeros(len(line_starts), bool)
+    is_g1[:len(head)] = (buf[head] == ord('G')) & (buf[head + 1] == ord('1')) & (buf[head + 2] == ord(' '))
+
+    # 파라미터 글자 뒤에 숫자가 오는 위치만 후보로 사용
+    pos = np.flatnonzero(_G1_WORD_INDEX[buf[:-1]])
+    word = _G1_WORD_INDEX[buf[pos]]
+    nxt = buf[pos + 1]
+    valid = _G1_NUMBER_CHARS[nxt] & ((word != 1) | (nxt != ord('-')))
+    pos, word = pos[valid], word[valid]
+    line = np.searchsorted(line_starts, pos, side='right') - 1
+    on_g1 = is_g1[line]
+    pos, word, line = pos[on_g1], word[on_g1], line[on_g1]
+
+    stops = np.append(np.flatnonzero(~_G1_NUMBER_CHARS[buf]), size)
+    end = stops[np.searchsorted(stops, pos + 1)]
+
+    columns = np.full((len(_G1_WORDS), len(line_starts)), np.nan)
+    for i in range(len(_G1_WORDS)):
+        sel = np.flatnonzero(word == i + 1)
+        # 같은 줄에서 처음 나온 값만 사용
+        sel = sel[np.concatenate(([True], line[sel][1:] != line[sel][:-1]))] if len(sel) else sel
+        columns[i, line[sel]] = _parse_decimal_runs(buf, pos[sel] + 1, end[sel], signed=i > 0)
+    return columns[:, is_g1]
+
+
+def _integrate_move_time_numpy(x, y, z, feed, last_x, last_y, last_z) -> float:
+    """G1 이동들의 소요 시간(초) 합계 - 구간 거리 / feedrate(mm/min)."""
+    distance = np.sqrt(
+        np.diff(x, prepend=last_x) ** 2
+        + np.diff(y, prepend=last_y) ** 2
+        + np.diff(z, prepend=last_z) ** 2
+    )
+    moving = (feed > 0) & (distance > 0)
+    return float((distance[moving] / feed[moving]).sum()) * 60
+
+
+def _integrate_move_time_loop(x, y, z, feed, last_x, last_y, last_z):
+    """_integrate_move_time_numpy 와 같은 계산을 한 번의 루프로 (Numba 컴파일 대상)."""
+    total = 0.0
+    for i in range(x.size):
+        dx = x[i] - last_x
+        dy = y[i] - last_y
+        dz = z[i] - last_z
+        distance = (dx * dx + dy * dy + dz * dz) ** 0.5
+        if feed[i] > 0 and distance > 0:
+            total += distance / feed[i]
+        last_x, last_y, last_z = x[i], y[i], z[i]
+    return total * 60
+
+
+# Numba 가 있으면 중간 배열 없이 한 번에 도는 JIT 커널을 사용 (없으면 NumPy 벡터 연산)
+# 컴파일은 첫 호출 때 서버 프로세스에서 한 번만 일어남 (파싱은 asyncio.to_thread 로 실행)
+if NUMBA_AVAILABLE:
+    _integrate_move_time = numba.njit(nogil=True)(_integrate_move_time_loop)
+else:
+    _integrate_move_time = _integrate_move_time_numpy
+
+
 def calculate_gcode_stats_from_content(gcode_path: str) -> Dict[str, any]:
     """
     G-code 본문을 직접 파싱하여 실제 출력 시간과 필라멘트 사용량 계산.
 
     CuraEngine이 TIME과 MATERIAL에 더미값을 넣는 경우를 대비하여
-    G1 명령어를 직접 분석합니다.
+    G1 명령어를 직접 분석합니다. CURA_GCODE_SCAN_CHUNK 단위로 읽어
+    G1 파라미터 추출과 거리/시간 계산을 NumPy 로 벡터화합니다.
+
+    결과는 (경로, mtime, 크기) 기준으로 캐시되므로 같은 파일을 다시 요청하면
+    파일을 다시 읽지 않습니다.
     """
-    from pathlib import Path
+    try:
+        st = os.stat(gcode_path)
+    except OSError:
+        return dict.fromkeys((
+            'calculated_time_seconds', 'calculated_filament_mm',
+            'calculated_filament_m', 'calculated_filament_g',
+        ))
+    return dict(_calculate_gcode_stats_cached(str(gcode_path), st.st_mtime_ns, st.st_size))
+
+
+# 파싱은 asyncio.to_thread 로 서버 프로세스 안에서 실행되므로 모든 요청이 이 캐시를 공유
+@functools.lru_cache(maxsize=64)
+def _calculate_gcode_stats_cached(gcode_path: str, mtime_ns: int, size: int) -> Dict[str, any]:
+    """calculate_gcode_stats_from_content 캐시 (mtime/크기가 바뀌면 키가 달라져 다시 계산)."""
+    return _calculate_gcode_stats(gcode_path)
 
+
+def _calculate_gcode_stats(gcode_path: str) -> Dict[str, any]:
     stats = {
         'calculated_time_seconds': None,
         'calculated_filament_mm': None,
@@ -391,10 +999,7 @@ def calculate_gcode_stats_from_content(gcode_path: str) -> Dict[str, any]:
     }
 
     try:
-        gcode_file = Path(gcode_path)
-        if not gcode_file.exists():
-            return stats
-
+        gcode_file = Path(gcode_path)  # existence already checked by the caller's stat()
         total_time_seconds = 0.0
         max_e_value = 0.0
         current_feedrate = 0.0  # mm/min
@@ -402,45 +1007,40 @@ def calculate_gcode_stats_from_content(gcode_path: str) -> Dict[str, any]:
 
         logger.info("[GCodeCalc] Calculating actual time and filament from G-code commands...")
 
-        with open(gcode_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f):
-                line = line.strip()
-
-                # G1 이동 명령 파싱
-                if line.startswith('G1 '):
-                    import re
-
-                    # Feedrate (F) 추출
-                    f_match = re.search(r'F([\d.]+)', line)
-                    if f_match:
-                        current_feedrate = float(f_match.group(1))  # mm/min
-
-                    # Extrusion (E) 추출 - 최대값 추적
-                    e_match = re.search(r'E([\d.\-]+)', line)
-                    if e_match:
-                        e_value = float(e_match.group(1))
-                        if e_value > max_e_value:
-                            max_e_value = e_value
-
-                    # 좌표 추출
-                    x_match = re.search(r'X([\d.\-]+)', line)
-                    y_match = re.search(r'Y([\d.\-]+)', line)
-                    z_match = re.search(r'Z([\d.\-]+)', line)
-
-                    x = float(x_match.group(1)) if x_match else last_x
-                    y = float(y_match.group(1)) if y_match else last_y
-                    z = float(z_match.group(1)) if z_match else last_z
-
-                    # 이동 거리 계산
-                    import math
-                    distance = math.sqrt((x - last_x)**2 + (y - last_y)**2 + (z - last_z)**2)
-
-                    # 시간 계산 (distance / feedrate)
-                    if current_feedrate > 0 and distance > 0:
-                        time_minutes = distance / current_feedrate
-                        total_time_seconds += time_minutes * 60
-
-                    last_x, last_y, last_z = x, y, z
+        with open(gcode_file, 'rb') as f:
+            _advise_sequential(f)
+            pending = b''
+            while True:
+                block = f.read(CURA_GCODE_SCAN_CHUNK)
+                if block:
+                    # 줄 경계에서 자르고 나머지는 다음 청크로 넘김
+                    cut = block.rfind(b'\n') + 1
+                    if not cut:
+                        pending += block
+                        continue
+                    chunk, pending = pending + block[:cut], block[cut:]
+                else:
+                    chunk, pending = pending, b''
+                if chunk:
+                    # G1 이동 명령 파싱
+                    feed, e, x, y, z = _g1_word_columns(chunk)
+                    if len(feed):
+                        feed = _forward_fill(feed, current_feedrate)  # mm/min
+                        x = _forward_fill(x, last_x)
+                        y = _forward_fill(y, last_y)
+                        z = _forward_fill(z, last_z)
+
+                        # Extrusion (E) - 최대값 추적
+                        if not np.isnan(e).all():
+                            max_e_value = max(max_e_value, float(np.nanmax(e)))
+
+                        # 이동 거리 / 시간 계산 (distance / feedrate)
+                        total_time_seconds += _integrate_move_time(x, y, z, feed, last_x, last_y, last_z)
+
+                        current_feedrate = float(feed[-1])
+                        last_x, last_y, last_z = float(x[-1]), float(y[-1]), float(z[-1])
+                if not block:
+                    break
 
         # 결과 저장
         if total_time_seconds > 0:
@@ -451,10 +1051,9 @@ def calculate_gcode_stats_from_content(gcode_path: str) -> Dict[str, any]:
             stats['calculated_filament_m'] = round(max_e_value / 1000.0, 2)
 
             # 무게 계산 (1.75mm 필라멘트, PLA 1.24 g/cm³)
-            filament_radius_mm = 1.75 / 2.0
-            volume_mm3 = max_e_value * 3.14159 * (filament_radius_mm ** 2)
+            volume_mm3 = max_e_value * FILAMENT_AREA_MM2
             volume_cm3 = volume_mm3 / 1000.0
-            weight_g = volume_cm3 * 1.24
+            weight_g = volume_cm3 * PLA_DENSITY_G_PER_CM3
             stats['calculated_filament_g'] = round(weight_g, 2)
 
         logger.info("[GCodeCalc] Calculated: time=%ds (%.1fmin), filament=%.2fm (%.2fg)",
@@ -469,6 +1068,198 @@ def calculate_gcode_stats_from_content(gcode_path: str) -> Dict[str, any]:
     return stats
 
 
+def _format_print_time(seconds: int) -> str:
+    """포맷된 시간 계산 (예: "1h 30m")"""
+    hours, remainder = divmod(seconds, 3600)
+    minutes = remainder // 60
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+# --- parse_gcode_metadata 줄 핸들러: handler(stripped_line, metadata) ---
+
+def _meta_print_time(line: str, metadata: Dict[str, any]) -> None:
+    # 출력 시간 (초)
+    match = _GCODE_TIME_RE.search(line)
+    if match:
+        seconds = int(match.group(1))
+        metadata['print_time_seconds'] = seconds
+        metadata['print_time_formatted'] = _format_print_time(seconds)
+
+
+def _meta_filament_used(line: str, metadata: Dict[str, any]) -> None:
+    # 필라멘트 사용량 (미터) - Format 1: ";Filament used: 1.23m"
+    match = _GCODE_METERS_RE.search(line)
+    if match:
+        metadata['filament_used_m'] = float(match.group(1))
+    # Format 2: ";Filament used: [1.23]"
+    match = _GCODE_BRACKET_NUMBER_RE.search(line)
+    if match and metadata['filament_used_m'] is None:
+        metadata['filament_used_m'] = float(match.group(1))
+
+
+def _meta_filament_weight(line: str, metadata: Dict[str, any]) -> None:
+    # 필라멘트 무게 (그램) - Format 1: "weight = 3.64g" or "3.64g"
+    match = _GCODE_GRAMS_RE.search(line)
+    if match:
+        metadata['filament_weight_g'] = float(match.group(1))
+    # Format 2: "[3.64]"
+    match = _GCODE_BRACKET_NUMBER_RE.search(line)
+    if match and metadata['filament_weight_g'] is None:
+        metadata['filament_weight_g'] = float(match.group(1))
+
+
+def _meta_filament_cost(line: str, metadata: Dict[str, any]) -> None:
+    match = _GCODE_NUMBER_RE.search(line)
+    if match:
+        metadata['filament_cost'] = float(match.group(1))
+
+
+def _meta_material_volume(line: str, metadata: Dict[str, any]) -> None:
+    # MATERIAL (Cura 5.x 형식 - mm³ 또는 cm³)
+    match = _GCODE_MATERIAL_RE.search(line)
+    if match:
+        volume_mm3 = float(match.group(1))
+        # mm³를 미터로 변환 (필라멘트 직경 1.75mm 가정)
+        # Volume = π * r² * length
+        # length = Volume / (π * r²)
+        length_mm = volume_mm3 / FILAMENT_AREA_MM2
+        length_m = length_mm / 1000.0
+
+        if metadata['filament_used_m'] is None:
+            metadata['filament_used_m'] = round(length_m, 2)
+
+        # 무게 계산 (PLA 밀도: 1.24 g/cm³)
+        if metadata['filament_weight_g'] is None:
+            volume_cm3 = volume_mm3 / 1000.0
+            weight_g = volume_cm3 * PLA_DENSITY_G_PER_CM3
+            metadata['filament_weight_g'] = round(weight_g, 2)
+
+
+def _meta_layer_count(line: str, metadata: Dict[str, any]) -> None:
+    match = _GCODE_LAYER_COUNT_RE.search(line)
+    if match:
+        metadata['layer_count'] = int(match.group(1))
+
+
+def _meta_layer_height(line: str, metadata: Dict[str, any]) -> None:
+    # Format 1: ";Layer height: 0.2"
+    match = _GCODE_LAYER_HEIGHT_RE.search(line)
+    if match:
+        metadata['layer_height'] = float(match.group(1))
+    # Format 2: ";LAYER_HEIGHT:0.2"
+    match = _GCODE_LAYER_HEIGHT_TAG_RE.search(line)
+    if match and metadata['layer_height'] is None:
+        metadata['layer_height'] = float(match.group(1))
+
+
+def _meta_bounding_box(key: str):
+    # Bounding Box (과학적 표기법 지원: 2.14748e+06)
+    def handler(line: str, metadata: Dict[str, any]) -> None:
+        # ";MINX:12.5" - 태그 뒤 값을 바로 float 변환 (정규식 불필요)
+        try:
+            value = float(line.partition(':')[2])
+        except ValueError:
+            return
+        # 더미값 체크 (1e6 이상은 무효)
+        if abs(value) < 1e6:
+            metadata['bounding_box'][key] = value
+    return handler
+
+
+def _meta_first_int(key: str):
+    # 온도 설정 (주석에서) - 처음 찾은 값만 사용
+    def handler(line: str, metadata: Dict[str, any]) -> None:
+        match = _GCODE_INT_RE.search(line)
+        if match and metadata[key] is None:
+            metadata[key] = int(match.group(1))
+    return handler
+
+
+def _meta_printer_name(line: str, metadata: Dict[str, any]) -> None:
+    match = _GCODE_PRINTER_NAME_RE.search(line)
+    if match:
+        metadata['printer_name'] = match.group(1).strip()
+
+
+def _meta_temperature_command(key: str):
+    # M104/M109: 노즐, M140/M190: 베드 온도 설정 (예: M104 S200)
+    def handler(line: str, metadata: Dict[str, any]) -> None:
+        if metadata[key] is not None:
+            return
+        match = _GCODE_S_PARAM_RE.search(line)
+        if match:
+            temp = int(float(match.group(1)))
+            if temp > 0:  # S0은 무시 (끄기 명령)
+                metadata[key] = temp
+    return handler
+
+
+# 주석 태그(":" / "=" 앞부분, CuraEngine 출력 그대로의 대소문자) -> 핸들러
+_GCODE_COMMENT_HANDLERS = {
+    ';TIME': _meta_print_time,
+    ';Filament used': _meta_filament_used,
+    ';Filament weight': _meta_filament_weight,
+    ';Filament mass': _meta_filament_weight,
+    ';Filament cost': _meta_filament_cost,
+    ';MATERIAL': _meta_material_volume,
+    ';MATERIAL2': _meta_material_volume,
+    ';LAYER_COUNT': _meta_layer_count,
+    ';Layer height': _meta_layer_height,
+    ';LAYER_HEIGHT': _meta_layer_height,
+    ';MINX': _meta_bounding_box('min_x'),
+    ';MAXX': _meta_bounding_box('max_x'),
+    ';MINY': _meta_bounding_box('min_y'),
+    ';MAXY': _meta_bounding_box('max_y'),
+    ';MINZ': _meta_bounding_box('min_z'),
+    ';MAXZ': _meta_bounding_box('max_z'),
+    ';Material print temperature': _meta_first_int('nozzle_temp'),
+    ';Material bed temperature': _meta_first_int('bed_temp'),
+    ';Printer name': _meta_printer_name,
+}
+# 소문자 표기도 함께 등록 (줄마다 lower()를 호출하지 않도록 미리 펼쳐 둠)
+_GCODE_COMMENT_HANDLERS.update({tag.lower(): handler for tag, handler in list(_GCODE_COMMENT_HANDLERS.items())})
+
+# G-code 명령어("M104 " 등, 공백 포함 5글자) -> 핸들러
+_GCODE_COMMAND_HANDLERS = {
+    'M104 ': _meta_temperature_command('nozzle_temp'),
+    'M109 ': _meta_temperature_command('nozzle_temp'),
+    'M140 ': _meta_temperature_command('bed_temp'),
+    'M190 ': _meta_temperature_command('bed_temp'),
+}
+_GCODE_META_LINE_STARTS = (';', 'M')
+
+
+# Binary STL: 80-byte header, uint32 triangle count, then 50-byte records
+_STL_TRIANGLE_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+
+def _read_stl_bounds(stl_path: str) -> np.ndarray:
+    """
+    STL 파일의 bounding box [[min_x, min_y, min_z], [max_x, max_y, max_z]] 계산.
+
+    Binary STL 은 삼각형 레코드를 np.fromfile 로 바로 읽어 꼭짓점 min/max 만
+    구합니다 (메시 구성 없음). ASCII STL 은 trimesh 로 처리합니다.
+    """
+    with open(stl_path, 'rb') as f:
+        f.seek(80)
+        count_bytes = f.read(4)
+        if len(count_bytes) == 4:
+            triangle_count = int.from_bytes(count_bytes, 'little')
+            if os.fstat(f.fileno()).st_size == 84 + _STL_TRIANGLE_DTYPE.itemsize * triangle_count and triangle_count:
+                triangles = np.fromfile(f, dtype=_STL_TRIANGLE_DTYPE, count=triangle_count)
+                vertices = triangles['vertices'].reshape(-1, 3).astype(np.float64)
+                return np.array([vertices.min(axis=0), vertices.max(axis=0)])
+
+    import trimesh
+    return np.asarray(trimesh.load(stl_path, file_type='stl').bounds, dtype=np.float64)
+
+
 def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
     """
     G-code 파일에서 메타데이터를 추출합니다.
@@ -487,9 +1278,6 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
     Returns:
         딕셔너리 형태의 메타데이터
     """
-    import re
-    from pathlib import Path
-
     metadata = {
         "print_time_seconds": None,
         "print_time_formatted": None,
@@ -513,181 +1301,47 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
         # G-code 파일을 스트리밍 방식으로 읽기
         # 필요한 정보를 모두 찾으면 조기 종료하여 성능 향상
         lines_read = 0
+        complete = False
 
-        with open(gcode_file, 'r', encoding='utf-8', errors='ignore') as f:
+        # 줄 단위 루프에서 쓰는 전역 조회를 지역 변수로 (LOAD_FAST)
+        line_starts = _GCODE_META_LINE_STARTS
+        comment_handler = _GCODE_COMMENT_HANDLERS.get
+        command_handler = _GCODE_COMMAND_HANDLERS.get
+
+        with open(gcode_file, 'r', encoding='utf-8', errors='ignore', buffering=CURA_GCODE_READ_BUFFER) as f:
+            _advise_sequential(f)
             for line in f:
                 lines_read += 1
-                line = line.strip()
 
                 # 모든 주요 메타데이터를 찾았는지 체크 (조기 종료 조건)
                 # 헤더 정보(TIME, MATERIAL 등)는 처음 부분에 있고,
                 # 온도 정보(M104, M140)는 중간~후반부에 있으므로
-                # 모든 정보를 찾은 후에만 종료
-                if (lines_read > 100 and  # 최소 100줄은 읽기
-                    metadata.get('nozzle_temp') is not None and
-                    metadata.get('bed_temp') is not None and
-                    metadata.get('print_time_seconds') is not None and
-                    metadata.get('layer_count') is not None):
+                # 모든 정보를 찾은 후에만 종료 (최소 100줄은 읽기)
+                if complete and lines_read > 100:
                     # 모든 주요 정보를 찾았으면 더 읽을 필요 없음
                     logger.info("[GCodeMeta] All metadata found at line %d, stopping scan", lines_read)
                     break
 
-                # 출력 시간 (초)
-                if line.startswith(';TIME:'):
-                    match = re.search(r';TIME:(\d+)', line)
-                    if match:
-                        seconds = int(match.group(1))
-                        metadata['print_time_seconds'] = seconds
-
-                        # 포맷된 시간 계산 (예: "1h 30m")
-                        hours = seconds // 3600
-                        minutes = (seconds % 3600) // 60
-                        if hours > 0:
-                            metadata['print_time_formatted'] = f"{hours}h {minutes}m"
-                        else:
-                            metadata['print_time_formatted'] = f"{minutes}m"
-
-                # 필라멘트 사용량 (미터) - 여러 형식 지원
-                elif ';Filament used' in line.lower():
-                    # Format 1: ";Filament used: 1.23m"
-                    match = re.search(r'([\d.]+)\s*m\b', line, re.IGNORECASE)
-                    if match:
-                        metadata['filament_used_m'] = float(match.group(1))
-                    # Format 2: ";Filament used: [1.23]"
-                    match = re.search(r'\[([\d.]+)\]', line)
-                    if match and metadata['filament_used_m'] is None:
-                        metadata['filament_used_m'] = float(match.group(1))
-
-                # 필라멘트 무게 (그램) - 여러 형식 지원
-                elif ';Filament weight' in line.lower() or ';Filament mass' in line.lower():
-                    # Format 1: "weight = 3.64g" or "3.64g"
-                    match = re.search(r'([\d.]+)\s*g\b', line, re.IGNORECASE)
-                    if match:
-                        metadata['filament_weight_g'] = float(match.group(1))
-                    # Format 2: "[3.64]"
-                    match = re.search(r'\[([\d.]+)\]', line)
-                    if match and metadata['filament_weight_g'] is None:
-                        metadata['filament_weight_g'] = float(match.group(1))
-
-                # 필라멘트 비용
-                elif ';Filament cost' in line.lower():
-                    match = re.search(r'([\d.]+)', line)
-                    if match:
-                        metadata['filament_cost'] = float(match.group(1))
-
-                # MATERIAL (Cura 5.x 형식 - mm³ 또는 cm³)
-                elif line.startswith(';MATERIAL:') or line.startswith(';MATERIAL2:'):
-                    match = re.search(r';MATERIAL2?:([\d.]+)', line)
-                    if match:
-                        volume_mm3 = float(match.group(1))
-                        # mm³를 미터로 변환 (필라멘트 직경 1.75mm 가정)
-                        # Volume = π * r² * length
-                        # length = Volume / (π * r²)
-                        # r = 1.75/2 = 0.875mm
-                        filament_radius_mm = 1.75 / 2.0
-                        area_mm2 = 3.14159 * (filament_radius_mm ** 2)
-                        length_mm = volume_mm3 / area_mm2
-                        length_m = length_mm / 1000.0
-
-                        if metadata['filament_used_m'] is None:
-                            metadata['filament_used_m'] = round(length_m, 2)
-
-                        # 무게 계산 (PLA 밀도: 1.24 g/cm³)
-                        if metadata['filament_weight_g'] is None:
-                            volume_cm3 = volume_mm3 / 1000.0
-                            weight_g = volume_cm3 * 1.24  # PLA 밀도
-                            metadata['filament_weight_g'] = round(weight_g, 2)
-
-                # 레이어 수
-                elif line.startswith(';LAYER_COUNT:'):
-                    match = re.search(r';LAYER_COUNT:(\d+)', line)
-                    if match:
-                        metadata['layer_count'] = int(match.group(1))
-
-                # 레이어 높이 - 여러 형식 지원
-                elif ';Layer height' in line.lower() or ';LAYER_HEIGHT' in line:
-                    # Format 1: ";Layer height: 0.2"
-                    match = re.search(r'height[:\s]+([\d.]+)', line, re.IGNORECASE)
-                    if match:
-                        metadata['layer_height'] = float(match.group(1))
-                    # Format 2: ";LAYER_HEIGHT:0.2"
-                    match = re.search(r'LAYER_HEIGHT:([\d.]+)', line)
-                    if match and metadata['layer_height'] is None:
-                        metadata['layer_height'] = float(match.group(1))
-
-                # Bounding Box (과학적 표기법 지원: 2.14748e+06)
-                elif line.startswith(';MINX:'):
-                    match = re.search(r';MINX:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        # 더미값 체크 (1e6 이상은 무효)
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['min_x'] = value
-                elif line.startswith(';MAXX:'):
-                    match = re.search(r';MAXX:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['max_x'] = value
-                elif line.startswith(';MINY:'):
-                    match = re.search(r';MINY:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['min_y'] = value
-                elif line.startswith(';MAXY:'):
-                    match = re.search(r';MAXY:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['max_y'] = value
-                elif line.startswith(';MINZ:'):
-                    match = re.search(r';MINZ:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['min_z'] = value
-                elif line.startswith(';MAXZ:'):
-                    match = re.search(r';MAXZ:([\d.\-+eE]+)', line)
-                    if match:
-                        value = float(match.group(1))
-                        if abs(value) < 1e6:
-                            metadata['bounding_box']['max_z'] = value
-
-                # 온도 설정 - 노즐 (주석 또는 G-code 명령어에서)
-                elif ';Material print temperature:' in line.lower():
-                    match = re.search(r'(\d+)', line)
-                    if match and metadata['nozzle_temp'] is None:
-                        metadata['nozzle_temp'] = int(match.group(1))
-
-                # 온도 설정 - 베드 (주석에서)
-                elif ';Material bed temperature:' in line.lower():
-                    match = re.search(r'(\d+)', line)
-                    if match and metadata['bed_temp'] is None:
-                        metadata['bed_temp'] = int(match.group(1))
-
-                # 프린터 이름
-                elif line.startswith(';Printer name:') or line.startswith(';FLAVOR:'):
-                    if 'Printer name:' in line:
-                        match = re.search(r';Printer name:\s*(.+)', line)
-                        if match:
-                            metadata['printer_name'] = match.group(1).strip()
-
-                # M104/M109: 노즐 온도 설정 (예: M104 S200)
-                elif (line.startswith('M104 ') or line.startswith('M109 ')) and metadata['nozzle_temp'] is None:
-                    match = re.search(r'S([\d.]+)', line)
-                    if match:
-                        temp = int(float(match.group(1)))
-                        if temp > 0:  # S0은 무시 (끄기 명령)
-                            metadata['nozzle_temp'] = temp
-
-                # M140/M190: 베드 온도 설정 (예: M140 S60)
-                elif (line.startswith('M140 ') or line.startswith('M190 ')) and metadata['bed_temp'] is None:
-                    match = re.search(r'S([\d.]+)', line)
-                    if match:
-                        temp = int(float(match.group(1)))
-                        if temp > 0:  # S0은 무시
-                            metadata['bed_temp'] = temp
+                # 대부분의 줄(G0/G1 이동 명령)은 주석(;)이나 M 명령이 아니므로 바로 건너뜀
+                if line[:1] not in line_starts:
+                    continue
+
+                line = line.strip()
+                if line.startswith(';'):
+                    # ";TAG: value" / ";TAG = value" -> 태그로 핸들러 조회
+                    handler = comment_handler(line.partition(':')[0].partition('=')[0].rstrip())
+                else:
+                    # "M104 S200" -> 명령어로 핸들러 조회
+                    handler = command_handler(line[:5])
+                if handler is not None:
+                    handler(line, metadata)
+                    # 메타데이터는 핸들러에서만 바뀌므로 완료 여부도 이때만 다시 계산
+                    complete = (
+                        metadata['nozzle_temp'] is not None and
+                        metadata['bed_temp'] is not None and
+                        metadata['print_time_seconds'] is not None and
+                        metadata['layer_count'] is not None
+                    )
 
         # 모델 크기 계산 (bounding box가 있으면)
         bbox = metadata['bounding_box']
@@ -725,10 +1379,8 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
             stl_path = str(gcode_file).replace('.gcode', '.stl')
             if os.path.exists(stl_path):
                 try:
-                    import trimesh
                     logger.info("[GCodeMeta] Reading bounding box from STL: %s", stl_path)
-                    stl_mesh = trimesh.load(stl_path, file_type='stl')
-                    stl_bounds = stl_mesh.bounds
+                    stl_bounds = _read_stl_bounds(stl_path)
 
                     metadata['bounding_box'] = {
                         'min_x': round(stl_bounds[0, 0], 2),
@@ -752,10 +1404,12 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
 
         # 더미값 체크 및 실제 계산 수행
         # TIME:6666 또는 MATERIAL:6666 같은 더미값 감지
-        is_dummy_time = (metadata.get('print_time_seconds') == 6666)
-        is_dummy_material = (metadata.get('filament_used_m') is None or
-                            metadata.get('filament_used_m') == 0 or
-                            metadata.get('filament_used_m') > 1000)  # 1km 이상은 비정상
+        md_get = metadata.get
+        filament_used_m = md_get('filament_used_m')
+        is_dummy_time = (md_get('print_time_seconds') == 6666)
+        is_dummy_material = (filament_used_m is None or
+                            filament_used_m == 0 or
+                            filament_used_m > 1000)  # 1km 이상은 비정상
 
         if is_dummy_time or is_dummy_material:
             logger.warning("[GCodeMeta] Detected dummy/invalid values - calculating from G-code content...")
@@ -764,13 +1418,7 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
             # 더미값인 경우 계산값으로 대체
             if is_dummy_time and calculated_stats.get('calculated_time_seconds'):
                 metadata['print_time_seconds'] = calculated_stats['calculated_time_seconds']
-                seconds = metadata['print_time_seconds']
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                if hours > 0:
-                    metadata['print_time_formatted'] = f"{hours}h {minutes}m"
-                else:
-                    metadata['print_time_formatted'] = f"{minutes}m"
+                metadata['print_time_formatted'] = _format_print_time(metadata['print_time_seconds'])
 
             if is_dummy_material:
                 if calculated_stats.get('calculated_filament_m'):
@@ -778,30 +1426,43 @@ def parse_gcode_metadata(gcode_path: str) -> Dict[str, any]:
                 if calculated_stats.get('calculated_filament_g'):
                     metadata['filament_weight_g'] = calculated_stats['calculated_filament_g']
 
-        # 로그 출력
-        logger.info("[GCodeMeta] Parsed metadata from: %s", gcode_file.name)
-        logger.info("[GCodeMeta]   Print time: %s (%s seconds)",
-                   metadata.get('print_time_formatted', 'N/A'),
-                   metadata.get('print_time_seconds', 'N/A'))
-        logger.info("[GCodeMeta]   Filament: %.2f m, %.2f g",
-                   metadata.get('filament_used_m') or 0,
-                   metadata.get('filament_weight_g') or 0)
-        logger.info("[GCodeMeta]   Layers: %s (height: %s mm)",
-                   metadata.get('layer_count', 'N/A'),
-                   metadata.get('layer_height', 'N/A'))
-        logger.info("[GCodeMeta]   Temperature: Nozzle=%s°C, Bed=%s°C",
-                   metadata.get('nozzle_temp', 'N/A'),
-                   metadata.get('bed_temp', 'N/A'))
+        # 로그 출력 (한 줄 레코드)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[GCodeMeta] Parsed metadata from %s: time=%s (%s seconds) filament=%.2f m, %.2f g "
+                "layers=%s (height: %s mm) temp: nozzle=%s°C, bed=%s°C",
+                gcode_file.name,
+                md_get('print_time_formatted'), md_get('print_time_seconds'),
+                md_get('filament_used_m') or 0, md_get('filament_weight_g') or 0,
+                md_get('layer_count'), md_get('layer_height'),
+                md_get('nozzle_temp'), md_get('bed_temp'),
+            )
 
         return metadata
 
     except Exception as e:
         logger.error("[GCodeMeta] Failed to parse metadata: %s", str(e))
-        import traceback
         traceback.print_exc()
         return metadata
 
 
+async def parse_gcode_metadata_async(gcode_path: str) -> Dict[str, any]:
+    """
+    parse_gcode_metadata 를 워커 스레드에서 실행합니다.
+
+    대용량 G-code 파싱이 이벤트 루프를 막지 않도록 asyncio.to_thread 로 넘깁니다.
+    무거운 구간(파일 읽기, NumPy 벡터 연산)은 GIL 을 놓고 실행되며,
+    통계 캐시와 로깅 설정도 서버 프로세스 안에서 그대로 공유됩니다.
+
+    Args:
+        gcode_path: G-code 파일 경로
+
+    Returns:
+        parse_gcode_metadata 와 동일한 메타데이터 딕셔너리
+    """
+    return await asyncio.to_thread(parse_gcode_metadata, str(gcode_path))
+
+
 async def convert_stl_to_gcode(
     stl_path: str,
     gcode_path: str,
@@ -821,47 +1482,39 @@ async def convert_stl_to_gcode(
     Returns:
         bool: Success status
     """
-    if not is_curaengine_available():
+    # Printer definition is passed down explicitly (no module-global override),
+    # so concurrent slices with different printers cannot clobber each other
+    definition_json = CURA_DEFINITION_JSON
+    if printer_definition_path:
+        if not Path(printer_definition_path).exists():
+            raise RuntimeError(f"Printer definition not found: {printer_definition_path}")
+        definition_json = printer_definition_path
+        logger.info("[Cura] Using custom printer definition: %s", printer_definition_path)
+
+    if not is_curaengine_available(definition_json):
         raise RuntimeError("CuraEngine is not configured or not available")
 
+    # The STL is checked once, in run_curaengine_process (engine/definition checks are cached)
     stl_file = Path(stl_path)
     gcode_file = Path(gcode_path)
 
-    if not stl_file.exists():
-        raise RuntimeError(f"Input STL file not found: {stl_path}")
-
     # Merge settings
     settings = merge_settings(custom_settings)
 
-    # Override printer definition if provided
-    global CURA_DEFINITION_JSON
-    if printer_definition_path:
-        if not Path(printer_definition_path).exists():
-            raise RuntimeError(f"Printer definition not found: {printer_definition_path}")
-        # Temporarily override
-        original_def = CURA_DEFINITION_JSON
-        CURA_DEFINITION_JSON = printer_definition_path
-        logger.info("[Cura] Using custom printer definition: %s", printer_definition_path)
-
-    try:
-        # Run slicing
-        logger.info("[Cura] Starting slicing: %s -> %s", stl_path, gcode_path)
-        success, log_output = await run_curaengine_process(
-            stl_file,
-            gcode_file,
-            settings,
-        )
-
-        if not success:
-            raise RuntimeError(f"Slicing failed: {log_output[:500]}")
+    # Run slicing
+    logger.info("[Cura] Starting slicing: %s -> %s", stl_path, gcode_path)
+    success, log_output = await run_curaengine_process(
+        stl_file,
+        gcode_file,
+        settings,
+        definition_json,
+    )
 
-        logger.info("[Cura] Slicing completed successfully")
-        return True
+    if not success:
+        raise RuntimeError(f"Slicing failed: {log_output[:500]}")
 
-    finally:
-        # Restore original definition if it was overridden
-        if printer_definition_path:
-            CURA_DEFINITION_JSON = original_def
+    logger.info("[Cura] Slicing completed successfully")
+    return True
 
 
 async def convert_stl_to_gcode_with_printer_name(
@@ -882,42 +1535,21 @@ async def convert_stl_to_gcode_with_printer_name(
     Returns:
         bool: True if slicing succeeded, False otherwise
     """
-    # Cura definitions directory
-    # CURAENGINE_PATH = C:\Program Files\UltiMaker Cura 5.7.1\CuraEngine.exe
-    # definitions_dir = C:\Program Files\UltiMaker Cura 5.7.1\share\cura\resources\definitions
-    curaengine_path = Path(os.getenv("CURAENGINE_PATH", ""))
-    cura_root = curaengine_path.parent  # C:\Program Files\UltiMaker Cura 5.7.1
-    definitions_dir = cura_root / "share" / "cura" / "resources" / "definitions"
-
-    # Find printer def file (remove .def if already in printer_name)
-    if printer_name.endswith(".def"):
-        printer_name = printer_name[:-4]  # Remove '.def'
-
-    printer_def_path = definitions_dir / f"{printer_name}.def.json"
-
-    if not printer_def_path.exists():
-        logger.error("[Cura] Printer definition not found: %s", printer_def_path)
+    try:
+        printer_def_path = _resolve_printer_def(printer_name)
+    except FileNotFoundError as e:
+        logger.error("[Cura] Printer definition not found: %s", e.filename)
         return False
 
     logger.info("[Cura] Using printer definition: %s", printer_name)
     logger.info("[Cura] Def file path: %s", printer_def_path)
 
-    # Temporarily override CURA_DEFINITION_JSON
-    global CURA_DEFINITION_JSON
-    original_def = CURA_DEFINITION_JSON
-    CURA_DEFINITION_JSON = str(printer_def_path)
-
-    try:
-        # Use convert_stl_to_gcode which will use the overridden def path
-        result = await convert_stl_to_gcode(
-            stl_path=stl_path,
-            gcode_path=gcode_path,
-            custom_settings=custom_settings,
-        )
-        return result
-    finally:
-        # Restore original definition
-        CURA_DEFINITION_JSON = original_def
+    return await convert_stl_to_gcode(
+        stl_path=stl_path,
+        gcode_path=gcode_path,
+        custom_settings=custom_settings,
+        printer_definition_path=str(printer_def_path),
+    )
 
 
 async def convert_stl_to_gcode_with_definition(
@@ -942,116 +1574,59 @@ async def convert_stl_to_gcode_with_definition(
         bool: Success status
     """
     logger.warning("[Cura] convert_stl_to_gcode_with_definition() called - will raise exception for fallback")
-    logger.info("[Cura] Printer definition keys: %s", list(printer_definition.keys()))
 
     # 이 함수는 의도적으로 실패하여 fallback이 작동하도록 함
     raise RuntimeError("Custom printer definition not supported - use fallback to fdmprinter + bed size")
 
-    # Write printer definition to temporary file in Cura definitions directory
-    # This allows CuraEngine to resolve inheritance
-    import tempfile
-    import json
-    import shutil
-
-    # Get Cura definitions directory
-    curaengine_path = Path(os.getenv("CURAENGINE_PATH", ""))
-    cura_root = curaengine_path.parent
-    definitions_dir = cura_root / "share" / "cura" / "resources" / "definitions"
-
-    if not definitions_dir.exists():
-        raise RuntimeError(f"Cura definitions directory not found: {definitions_dir}")
-
-    # Create temp file in definitions directory so inheritance works
-    temp_def_file = tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.def.json',
-        delete=False,
-        dir=definitions_dir,  # 중요: definitions 디렉토리에 생성
-        prefix='temp_client_'
-    )
 
-    try:
-        # 전략: fdmprinter를 base로 사용하고 클라이언트 overrides 적용
-        # CuraEngine은 상속을 지원하므로 클라이언트 정의가 fdmprinter를 상속하도록 함
-
-        # 클라이언트가 overrides만 보낸 경우 -> 완전한 정의로 변환
-        client_overrides = {}
-
-        if 'overrides' in printer_definition:
-            logger.info("[Cura] Client provided %d overrides", len(printer_definition['overrides']))
-            client_overrides = printer_definition['overrides']
-
-        # 클라이언트가 settings를 보낸 경우도 overrides로 처리
-        if 'settings' in printer_definition and printer_definition['settings']:
-            logger.info("[Cura] Client provided %d settings", len(printer_definition['settings']))
-            # settings를 overrides 형식으로 변환
-            for key, value in printer_definition['settings'].items():
-                if isinstance(value, dict) and 'default_value' in value:
-                    client_overrides[key] = value
-                else:
-                    # 값만 제공된 경우 default_value 형식으로 변환
-                    client_overrides[key] = {'default_value': value}
-
-        # fdmprinter를 상속하는 새 정의 생성
-        custom_definition = {
-            "version": 2,
-            "name": printer_definition.get('name', 'Custom Printer'),
-            "inherits": "fdmprinter",  # CuraEngine이 같은 디렉토리에서 fdmprinter 찾음
-            "metadata": {
-                "visible": True,
-                "type": "machine"
-            },
-            "overrides": client_overrides
-        }
+def _dumps_json_bytes(obj: Dict[str, any]) -> bytes:
+    """Serialise to compact JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
-        # 메타데이터 병합
-        if 'metadata' in printer_definition:
-            custom_definition['metadata'].update(printer_definition['metadata'])
 
-        logger.info("[Cura] Created definition inheriting from fdmprinter with %d overrides",
-                   len(client_overrides))
-
-        # Write definition JSON
-        json.dump(custom_definition, temp_def_file, indent=2)
-        temp_def_file.close()
-        definition_path = temp_def_file.name
-
-        logger.info("[Cura] Created temporary printer definition in Cura directory: %s", definition_path)
+def _write_definition_file(definition, digest: Optional[str] = None) -> str:
+    """
+    Write a DB-stored printer definition (JSON bytes, string or dict) to OUTPUT_DIR.
 
-        # Merge settings
-        settings = merge_settings(custom_settings)
+    The file name is keyed by a hash of the serialised content, so repeat
+    requests for the same printer reuse the existing file instead of writing
+    a new one.
 
-        # Temporarily override CURA_DEFINITION_JSON
-        global CURA_DEFINITION_JSON
-        original_def = CURA_DEFINITION_JSON
-        CURA_DEFINITION_JSON = definition_path
+    Args:
+        definition: Pre-serialised JSON bytes, JSON string, or dict
+        digest: Optional precomputed hex hash of the content (skips hashing)
 
+    Returns:
+        Path to the .def.json file
+    """
+    if isinstance(definition, (bytes, bytearray)):
+        payload = bytes(definition)
+    elif isinstance(definition, str):
+        payload = definition.encode('utf-8')
+    else:
+        payload = _dumps_json_bytes(definition)
+    if not (digest and _DEFINITION_DIGEST_RE.fullmatch(digest)):
+        digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    definition_path = OUTPUT_DIR / f"printer_{digest}.def.json"
+
+    if not definition_path.exists():
+        # Write to a private temp file, then publish atomically
+        fd, temp_path = tempfile.mkstemp(suffix='.def.json', dir=OUTPUT_DIR)
         try:
-            # Run slicing
-            logger.info("[Cura] Starting slicing with client definition")
-            success, log_output = await run_curaengine_process(
-                stl_file,
-                gcode_file,
-                settings,
-            )
-
-            if not success:
-                raise RuntimeError(f"Slicing failed: {log_output[:500]}")
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(temp_path, definition_path)
+        except BaseException:
+            # Only the temp file we created is ever removed - never a caller-supplied path
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        logger.info("[Cura] Created definition file: %s", definition_path)
 
-            logger.info("[Cura] Slicing completed successfully")
-            return True
-
-        finally:
-            # Restore original definition
-            CURA_DEFINITION_JSON = original_def
-
-    finally:
-        # Clean up temp file
-        try:
-            Path(definition_path).unlink()
-            logger.info("[Cura] Cleaned up temp definition file")
-        except Exception as e:
-            logger.warning("[Cura] Failed to cleanup temp file: %s", e)
+    return str(definition_path)
 
 
 async def convert_stl_to_gcode_with_db_profile(
@@ -1071,6 +1646,8 @@ async def convert_stl_to_gcode_with_db_profile(
         gcode_path: Absolute path to output G-code file
         printer_profile: Dictionary containing printer profile from DB with keys:
             - 'definition_json': Path to printer definition file OR JSON string
+            - 'definition_bytes': Optional pre-serialised definition JSON (preferred)
+            - 'definition_hash': Optional hex hash stored alongside definition_bytes
             - 'settings': Optional default settings for this printer
         custom_settings: Optional user settings to override printer defaults
 
@@ -1078,53 +1655,33 @@ async def convert_stl_to_gcode_with_db_profile(
         bool: Success status
     """
     # Extract definition path/content from profile
+    definition_bytes = printer_profile.get('definition_bytes')
     definition = printer_profile.get('definition_json')
     printer_default_settings = printer_profile.get('settings', {})
 
-    if not definition:
+    if not (definition or definition_bytes):
         raise RuntimeError("Printer profile missing 'definition_json'")
 
     # Handle if definition is a JSON string (stored in DB)
     definition_path = None
-    if isinstance(definition, str) and definition.endswith('.json'):
+    if definition_bytes:
+        # Pre-serialised by the DB layer - no dict->JSON conversion, hash reused if stored
+        definition_path = _write_definition_file(definition_bytes, printer_profile.get('definition_hash'))
+    elif isinstance(definition, str) and definition.endswith('.json'):
         # It's a file path
         definition_path = definition
     elif isinstance(definition, (str, dict)):
-        # It's JSON content - need to write to temp file
-        import tempfile
-        temp_def = tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.def.json',
-            delete=False,
-            dir=OUTPUT_DIR
-        )
-        if isinstance(definition, str):
-            temp_def.write(definition)
-        else:
-            json.dump(definition, temp_def)
-        temp_def.close()
-        definition_path = temp_def.name
-        logger.info("[Cura] Created temporary definition file: %s", definition_path)
+        # It's JSON content - written once per distinct content and reused
+        definition_path = _write_definition_file(definition)
 
     # Merge settings: defaults < printer defaults < custom settings
-    merged_settings = DEFAULT_CURA_SETTINGS.copy()
-    if printer_default_settings:
-        merged_settings.update(printer_default_settings)
-    if custom_settings:
-        merged_settings.update(custom_settings)
-
-    try:
-        return await convert_stl_to_gcode(
-            stl_path=stl_path,
-            gcode_path=gcode_path,
-            custom_settings=merged_settings,
-            printer_definition_path=definition_path,
-        )
-    finally:
-        # Clean up temp file if created
-        if definition_path and 'temp' in definition_path:
-            try:
-                Path(definition_path).unlink()
-                logger.info("[Cura] Cleaned up temp definition file")
-            except Exception as e:
-                logger.warning("[Cura] Failed to cleanup temp file: %s", e)
+    # (defaults are layered in by merge_settings, so only the overrides are combined here)
+    merged_settings = {**(printer_default_settings or {}), **(custom_settings or {})}
+
+    # Content-addressed definition files are shared across requests - not deleted here
+    return await convert_stl_to_gcode(
+        stl_path=stl_path,
+        gcode_path=gcode_path,
+        custom_settings=merged_settings,
+        printer_definition_path=definition_path,
+    )
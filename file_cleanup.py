@@ -10,34 +10,47 @@ from typing import List, Optional
 logger = logging.getLogger("uvicorn.error")
 
 
-def cleanup_local_files(*file_paths: Optional[str], force: bool = False) -> int:
+def _remove_files(file_paths, force: bool = False) -> tuple:
     """
-    Delete local files safely
-
-    Args:
-        *file_paths: Variable number of file paths to delete
-        force: If True, don't log warnings for missing files
+    Delete files with one unlink() each (no exists() pre-check).
 
     Returns:
-        int: Number of files successfully deleted
+        tuple: (number of files deleted, set of paths that are now gone - deleted or already missing)
     """
     deleted_count = 0
+    gone = set()
 
     for file_path in file_paths:
         if not file_path:
             continue
 
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"[Cleanup] Deleted local file: {os.path.basename(file_path)}")
-                deleted_count += 1
-            elif not force:
+            os.remove(file_path)
+            logger.info(f"[Cleanup] Deleted local file: {os.path.basename(file_path)}")
+            deleted_count += 1
+            gone.add(file_path)
+        except FileNotFoundError:
+            gone.add(file_path)
+            if not force:
                 logger.warning(f"[Cleanup] File not found (already deleted?): {file_path}")
-
         except Exception as e:
             logger.error(f"[Cleanup] Failed to delete {file_path}: {e}")
 
+    return deleted_count, gone
+
+
+def cleanup_local_files(*file_paths: Optional[str], force: bool = False) -> int:
+    """
+    Delete local files safely
+
+    Args:
+        *file_paths: Variable number of file paths to delete
+        force: If True, don't log warnings for missing files
+
+    Returns:
+        int: Number of files successfully deleted
+    """
+    deleted_count, _ = _remove_files(file_paths, force=force)
     return deleted_count
 
 
@@ -59,30 +72,23 @@ def cleanup_model_files(
     Returns:
         dict: Cleanup results with counts
     """
-    files_to_delete = []
-
-    if glb_path:
-        files_to_delete.append(glb_path)
-
-    if stl_path:
-        files_to_delete.append(stl_path)
-
-    if thumbnail_path:
-        files_to_delete.append(thumbnail_path)
-
-    if source_image_path:
-        files_to_delete.append(source_image_path)
+    paths = {
+        "glb": glb_path,
+        "stl": stl_path,
+        "thumbnail": thumbnail_path,
+        "source": source_image_path,
+    }
+    files_to_delete = [path for path in paths.values() if path]
 
-    deleted_count = cleanup_local_files(*files_to_delete)
+    # 삭제 결과로 상태를 만든다 (삭제 후 exists()로 다시 확인하지 않음)
+    deleted_count, gone = _remove_files(files_to_delete)
 
     result = {
-        "total_files": len([f for f in files_to_delete if f]),
+        "total_files": len(files_to_delete),
         "deleted_count": deleted_count,
         "files": {
-            "glb": "deleted" if glb_path and not os.path.exists(glb_path) else "kept",
-            "stl": "deleted" if stl_path and not os.path.exists(stl_path) else "kept",
-            "thumbnail": "deleted" if thumbnail_path and not os.path.exists(thumbnail_path) else "kept",
-            "source": "deleted" if source_image_path and not os.path.exists(source_image_path) else "kept",
+            key: "deleted" if path and path in gone else "kept"
+            for key, path in paths.items()
         }
     }
 
@@ -104,31 +110,33 @@ def cleanup_old_files(directory: str, max_age_hours: int = 24) -> int:
     """
     import time
 
-    if not os.path.exists(directory):
-        logger.warning(f"[Cleanup] Directory not found: {directory}")
-        return 0
-
     current_time = time.time()
-    max_age_seconds = max_age_hours * 3600
+    cutoff = current_time - max_age_hours * 3600
     deleted_count = 0
 
     try:
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-
-            if not os.path.isfile(file_path):
-                continue
-
-            file_age = current_time - os.path.getmtime(file_path)
-
-            if file_age > max_age_seconds:
+        # scandir: 파일 종류는 dirent에서, mtime은 항목당 stat 한 번으로 확인
+        with os.scandir(directory) as entries:
+            for entry in entries:
                 try:
-                    os.remove(file_path)
-                    logger.info(f"[Cleanup] Deleted old file: {filename} (age: {file_age / 3600:.1f}h)")
-                    deleted_count += 1
-                except Exception as e:
-                    logger.error(f"[Cleanup] Failed to delete {filename}: {e}")
-
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    # 스캔 도중 다른 요청이 지운 파일은 건너뜀 (디렉터리 없음으로 처리하지 않음)
+                    continue
+
+                if mtime < cutoff:
+                    try:
+                        os.remove(entry.path)
+                        logger.info(f"[Cleanup] Deleted old file: {entry.name} (age: {(current_time - mtime) / 3600:.1f}h)")
+                        deleted_count += 1
+                    except Exception as e:
+                        logger.error(f"[Cleanup] Failed to delete {entry.name}: {e}")
+
+    except FileNotFoundError:
+        logger.warning(f"[Cleanup] Directory not found: {directory}")
+        return 0
     except Exception as e:
         logger.error(f"[Cleanup] Error scanning directory {directory}: {e}")
 
@@ -11,6 +11,7 @@ import time
 from typing import List, Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from langchain_core.messages import HumanMessage
 
 from ..llm.client import get_llm_client
@@ -38,6 +39,22 @@ PROBLEM_SEARCH_TEMPLATES = {
 }
 
 
+# 검색 API/썸네일 호스트 연결(TCP+TLS)을 요청 간에 재사용하는 공유 세션
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """keep-alive 커넥션 풀을 가진 공유 requests 세션 (지연 생성)"""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _session = session
+    return _session
+
+
 class BraveImageSearcher:
     """
     Brave 이미지 검색기
@@ -219,7 +236,7 @@ Output only the search query, nothing else."""
         max_retries = 2
         for attempt in range(max_retries + 1):
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=15)
+                response = _get_session().get(url, headers=headers, params=params, timeout=15)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -295,7 +312,7 @@ Output only the search query, nothing else."""
                 filepath = os.path.join(save_dir, filename)
 
                 # 다운로드
-                response = requests.get(
+                response = _get_session().get(
                     thumbnail_url,
                     timeout=10,
                     headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
@@ -16,6 +16,13 @@ from fastapi.requests import Request
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field, TypeAdapter
 import httpx
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from modelling_api import (
     ModellingRequest,
     TaskStatusResponse,
@@ -43,6 +50,8 @@ from gcode_analyzer.chat import router as chat_router
 ALLOWED_ORIGINS_RAW = os.getenv("ALLOWED_ORIGINS", "*")
 ALLOWED_ORIGINS = [o.strip() for o in ALLOWED_ORIGINS_RAW.split(",")] if ALLOWED_ORIGINS_RAW else ["*"]
 PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "http://localhost:7000").rstrip("/")
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 업로드 모델 파일을 디스크로 옮길 때의 청크 크기
+MODELLING_STATUS_MAX_WAIT = 30.0  # 상태 조회 long-poll(?wait=) 최대 대기 시간 (초)
 
 logger = logging.getLogger("uvicorn.error")
 logger.info(f"[CORS] ALLOWED_ORIGINS loaded: {ALLOWED_ORIGINS}")
@@ -72,6 +81,11 @@ app.add_middleware(
 # app.mount("/files", StaticFiles(directory=os.getenv("OUTPUT_DIR", "./output")), name="files")
 
 
+def _loads_json(raw):
+    """Parse JSON form fields (orjson when available; its errors subclass json.JSONDecodeError)."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
 class ApiResponse(BaseModel):
     status: str
     data: Optional[Any] = None
@@ -426,7 +440,12 @@ async def process_modelling(request: Request, async_mode: bool = False):
         raise HTTPException(status_code=504, detail="Meshy timeout or network error")
 
 @app.get("/v1/process/modelling/{task_id}", response_model=ApiResponse)
-async def get_modelling(task_id: str):
+async def get_modelling(task_id: str, wait: float = 0):
+    # Long-poll: ?wait=N 이면 백그라운드 처리가 끝날 때까지 최대 N초(상한 있음) 응답을 보류
+    if wait > 0:
+        from background_tasks import wait_for_background_task
+        await wait_for_background_task(task_id, min(wait, MODELLING_STATUS_MAX_WAIT))
+
     data = await get_modelling_status(task_id)
     resp = TaskStatusResponse(**data).model_dump()
 
@@ -458,6 +477,16 @@ async def get_modelling(task_id: str):
     return ApiResponse(status="ok", data=resp)
 
 
+@app.delete("/v1/process/modelling/{task_id}", response_model=ApiResponse)
+async def cancel_modelling(task_id: str):
+    """진행 중인 백그라운드 모델링 작업 취소 (Blender 등 하위 프로세스도 함께 종료)"""
+    from background_tasks import cancel_background_task
+
+    if not cancel_background_task(task_id):
+        raise HTTPException(status_code=404, detail=f"No running task: {task_id}")
+    return ApiResponse(status="ok", data={"task_id": task_id, "cancelled": True})
+
+
 class CleanModelRequest(BaseModel):
     glb_path: Optional[str] = None
     task_id: Optional[str] = None
@@ -639,8 +668,8 @@ async def generate_gcode(payload: GenerateGCodeRequest):
         gcode_url = f"/files/{os.path.basename(gcode_path)}"
 
         # G-code 메타데이터 추출
-        from cura_processor import parse_gcode_metadata
-        gcode_metadata = parse_gcode_metadata(gcode_path)
+        from cura_processor import parse_gcode_metadata_async
+        gcode_metadata = await parse_gcode_metadata_async(gcode_path)
 
         response_data = {
             "task_id": task_id,
@@ -717,15 +746,17 @@ async def upload_stl_and_slice(
                    "Provided" if printer_definition_json else "None")
         logger.info("[UploadSTL]   - cura_settings_json: %s", cura_settings_json[:100] if cura_settings_json else "{}")
 
-        # 파일 저장
-        file_bytes = await file.read()
+        # 파일 저장 (청크 단위로 복사 - 수백 MB 모델도 메모리에 한 번에 올리지 않음)
         temp_filename = f"uploaded_{name_root}_{timestamp}{file_ext}"
         temp_path = os.path.join(output_dir, temp_filename)
 
+        saved_size = 0
         with open(temp_path, "wb") as f:
-            f.write(file_bytes)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                saved_size += len(chunk)
 
-        logger.info("[Upload] Saved: %s (%d bytes)", temp_path, len(file_bytes))
+        logger.info("[Upload] Saved: %s (%d bytes)", temp_path, saved_size)
 
         # STL 변환 (필요한 경우)
         stl_filename = f"uploaded_{name_root}_{timestamp}.stl"
@@ -861,7 +892,7 @@ async def upload_stl_and_slice(
 
         # Cura 설정 파싱
         try:
-            cura_settings = json.loads(cura_settings_json) if cura_settings_json else {}
+            cura_settings = _loads_json(cura_settings_json) if cura_settings_json else {}
             logger.info("[UploadSTL] Parsed Cura settings: %d parameters", len(cura_settings))
             if cura_settings:
                 for key, value in list(cura_settings.items())[:5]:  # 처음 5개만 로깅
@@ -887,7 +918,7 @@ async def upload_stl_and_slice(
         elif printer_definition_json:
             # 방법 2: printer_definition JSON 사용 (고급)
             try:
-                printer_definition = json.loads(printer_definition_json)
+                printer_definition = _loads_json(printer_definition_json)
             except json.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Invalid printer_definition_json format")
 
@@ -955,8 +986,8 @@ async def upload_stl_and_slice(
 
         # G-code 메타데이터 추출
         logger.info("[UploadSTL] Extracting G-code metadata...")
-        from cura_processor import parse_gcode_metadata
-        gcode_metadata = parse_gcode_metadata(gcode_path)
+        from cura_processor import parse_gcode_metadata_async
+        gcode_metadata = await parse_gcode_metadata_async(gcode_path)
 
         # 파일 정리 (최신 50개만 유지)
         cleanup_old_files(output_dir, max_files=50)
@@ -1106,7 +1137,13 @@ def cleanup_old_files(directory: str, max_files: int = 50):
 
 
 if __name__ == "__main__":
+    import sys
+    import asyncio
     import uvicorn
+
+    # CuraEngine은 asyncio subprocess로 실행되므로 Windows에서는 Proactor 루프가 필요
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
     uvicorn.run("main:app", host="0.0.0.0", port=7000, reload=False)
 
 
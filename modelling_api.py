@@ -5,6 +5,8 @@ import asyncio
 import time
 import uuid
 
+import httpx
+
 logger = logging.getLogger("uvicorn.error")
 
 # Ensure OUTPUT_DIR is set early so that utill can create the directory
@@ -76,6 +78,10 @@ TEXT_TO_3D_ENABLE_PBR = os.getenv("TEXT_TO_3D_ENABLE_PBR", "true").lower() == "t
 TEXT_TO_3D_TOPOLOGY = os.getenv("TEXT_TO_3D_TOPOLOGY", "quad")  # quad or triangle
 TEXT_TO_3D_TARGET_POLYCOUNT = int(os.getenv("TEXT_TO_3D_TARGET_POLYCOUNT", "30000"))
 
+# Task polling: progress가 그대로면 간격을 1.5배씩 늘리고(최대값까지) 진행되면 다시 기본 간격으로
+MESHY_POLL_MAX_INTERVAL = float(os.getenv("MESHY_POLL_MAX_INTERVAL", "30"))
+MESHY_POLL_BACKOFF = 1.5
+
 logger.info(
     "[MeshyCfg] base=%s key=%s output_dir=%s img_topology=%s img_polycount=%d txt_style=%s txt_pbr=%s txt_topology=%s txt_polycount=%d",
     MESHY_API_BASE,
@@ -105,26 +111,40 @@ def meshy_headers_get() -> dict:
     }
 
 
-async def meshy_get_task(endpoint: str, task_id: str) -> dict:
+async def meshy_get_task(endpoint: str, task_id: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """Meshy task 조회. client를 넘기면 그 연결(keep-alive)을 재사용한다."""
+    if client is None:
+        async with get_httpx_client() as client:
+            return await meshy_get_task(endpoint, task_id, client)
+
     logger.info("[MeshyReq] GET %s/%s", endpoint, task_id)
-    async with get_httpx_client() as client:
-        r = await client.get(f"{endpoint}/{task_id}", headers=meshy_headers_get(), timeout=30)
-        logger.info("[MeshyResp] GET %s -> %s", endpoint, r.status_code)
-        r.raise_for_status()
-        j = r.json()
-        logger.info(
-            "[MeshyTask] id=%s status=%s progress=%s url=%s",
-            task_id,
-            j.get("status"),
-            j.get("progress"),
-            pick_model_url(j),
-        )
-        return j
+    r = await client.get(f"{endpoint}/{task_id}", headers=meshy_headers_get(), timeout=30)
+    logger.info("[MeshyResp] GET %s -> %s", endpoint, r.status_code)
+    r.raise_for_status()
+    j = r.json()
+    logger.info(
+        "[MeshyTask] id=%s status=%s progress=%s url=%s",
+        task_id,
+        j.get("status"),
+        j.get("progress"),
+        pick_model_url(j),
+    )
+    return j
 
 
 async def poll_until_done(endpoint: str, task_id: str, timeout_sec: int = 20 * 60, interval: int = 6) -> Dict[str, Any]:
+    # 폴링 동안 하나의 클라이언트를 유지 -> 매 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+    async with get_httpx_client() as client:
+        return await _poll_until_done(client, endpoint, task_id, timeout_sec, interval)
+
+
+async def _poll_until_done(
+    client: httpx.AsyncClient, endpoint: str, task_id: str, timeout_sec: int, interval: int
+) -> Dict[str, Any]:
     start = time.monotonic()
     last_status: Optional[str] = None
+    last_progress: Any = None
+    delay = float(interval)
     retry_count = 0
     max_retries = 5  # 최대 5번 재시도 (약 30초)
 
@@ -133,7 +153,7 @@ async def poll_until_done(endpoint: str, task_id: str, timeout_sec: int = 20 * 6
             raise TimeoutError(f"Timeout: task {task_id} not finished within {timeout_sec}s")
 
         try:
-            task = await meshy_get_task(endpoint, task_id)
+            task = await meshy_get_task(endpoint, task_id, client)
             retry_count = 0  # 성공하면 재시도 카운트 리셋
         except Exception as e:
             # 404 에러는 task가 아직 등록되지 않은 것일 수 있음
@@ -152,7 +172,13 @@ async def poll_until_done(endpoint: str, task_id: str, timeout_sec: int = 20 * 6
             logger.info("[Poll] id=%s status=%s progress=%s", task_id, status, progress)
             last_status = status
         if status in ("PENDING", "PROCESSING", "IN_PROGRESS"):
-            await asyncio.sleep(interval)
+            # 진행이 없으면 백오프, 진행되면 기본 간격으로 복귀
+            if progress == last_progress:
+                delay = min(MESHY_POLL_MAX_INTERVAL, delay * MESHY_POLL_BACKOFF)
+            else:
+                delay = float(interval)
+                last_progress = progress
+            await asyncio.sleep(delay)
             continue
         if status == "FAILED":
             raise RuntimeError(f"Task failed: {task.get('task_error') or task}")
@@ -214,9 +240,57 @@ class TaskStatusResponse(BaseModel):
     progress: Optional[float] = None
     result_glb_url: Optional[str] = None
     raw: Optional[Any] = None
+    cancelled_locally: bool = False  # 서버측 후처리가 취소됨 (Meshy 작업 자체는 계속될 수 있음)
 
 
 # ---------- Services ----------
+async def _upload_model_files(
+    result: Dict[str, Any], user_id: str, model_id: str, supabase_client
+) -> tuple:
+    """
+    GLB/STL/썸네일을 Supabase Storage에 동시에 업로드하고 result에 URL을 기록한다.
+
+    업로드 함수는 동기(블로킹) 호출이므로 각각 스레드에서 실행해 이벤트 루프를 막지 않고,
+    세 번의 왕복을 순차 합이 아닌 가장 느린 하나의 시간으로 줄인다.
+
+    Returns:
+        (glb_upload_result, stl_upload_result, thumbnail_upload_result) - 파일이 없으면 None
+    """
+    async def _skip():
+        return None
+
+    # Upload cleaned GLB (preferred) or original GLB
+    glb_to_upload = result.get("cleaned_glb_path") or result.get("local_path")
+    uploads = [
+        asyncio.to_thread(
+            upload_glb_to_storage,
+            user_id=user_id, model_id=model_id, glb_file_path=glb_to_upload, supabase=supabase_client,
+        ) if glb_to_upload else _skip(),
+        asyncio.to_thread(
+            upload_stl_to_storage,
+            user_id=user_id, model_id=model_id, stl_file_path=result.get("stl_path"), supabase=supabase_client,
+        ) if result.get("stl_path") else _skip(),
+        asyncio.to_thread(
+            upload_thumbnail_to_storage,
+            user_id=user_id, model_id=model_id, thumbnail_file_path=result.get("thumbnail_path"),
+            supabase=supabase_client,
+        ) if result.get("thumbnail_path") else _skip(),
+    ]
+    glb_upload_result, stl_upload_result, thumbnail_upload_result = await asyncio.gather(*uploads)
+
+    if glb_upload_result:
+        logger.info("[Supabase] GLB uploaded: %s", glb_upload_result.get("public_url"))
+        result["supabase_glb_url"] = glb_upload_result.get("public_url")
+    if stl_upload_result:
+        logger.info("[Supabase] STL uploaded: %s", stl_upload_result.get("public_url"))
+        result["supabase_stl_url"] = stl_upload_result.get("public_url")
+    if thumbnail_upload_result:
+        logger.info("[Supabase] Thumbnail uploaded: %s", thumbnail_upload_result.get("public_url"))
+        result["supabase_thumbnail_url"] = thumbnail_upload_result.get("public_url")
+
+    return glb_upload_result, stl_upload_result, thumbnail_upload_result
+
+
 async def _complete_image_to_3d(
     task_id: str,
     endpoint: str,
@@ -244,7 +318,8 @@ async def _complete_image_to_3d(
     if user_id and SUPABASE_AVAILABLE:
         try:
             supabase_client = get_supabase_client()
-            create_ai_model_record(
+            await asyncio.to_thread(
+                create_ai_model_record,
                 user_id=user_id,
                 model_id=model_id,
                 generation_type="image_to_3d",
@@ -314,47 +389,14 @@ async def _complete_image_to_3d(
         # Upload to Supabase Storage if user_id provided
         if user_id and SUPABASE_AVAILABLE and supabase_client:
             try:
-                glb_upload_result = None
-                stl_upload_result = None
-                thumbnail_upload_result = None
-
-                # Upload cleaned GLB (preferred) or original GLB
-                glb_to_upload = result.get("cleaned_glb_path") or result.get("local_path")
-                if glb_to_upload:
-                    glb_upload_result = upload_glb_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        glb_file_path=glb_to_upload,
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] GLB uploaded: %s", glb_upload_result.get("public_url"))
-                    result["supabase_glb_url"] = glb_upload_result.get("public_url")
-
-                # Upload STL if available
-                if result.get("stl_path"):
-                    stl_upload_result = upload_stl_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        stl_file_path=result["stl_path"],
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] STL uploaded: %s", stl_upload_result.get("public_url"))
-                    result["supabase_stl_url"] = stl_upload_result.get("public_url")
-
-                # Upload thumbnail if available
-                if result.get("thumbnail_path"):
-                    thumbnail_upload_result = upload_thumbnail_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        thumbnail_file_path=result["thumbnail_path"],
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] Thumbnail uploaded: %s", thumbnail_upload_result.get("public_url"))
-                    result["supabase_thumbnail_url"] = thumbnail_upload_result.get("public_url")
+                glb_upload_result, stl_upload_result, thumbnail_upload_result = await _upload_model_files(
+                    result, user_id, model_id, supabase_client
+                )
 
                 # Update DB record to completed
                 if glb_upload_result:
-                    update_model_to_completed(
+                    await asyncio.to_thread(
+                        update_model_to_completed,
                         model_id=model_id,
                         storage_path=glb_upload_result.get("path"),
                         download_url=glb_upload_result.get("public_url"),
@@ -398,7 +440,7 @@ async def _complete_image_to_3d(
                 # Update to failed status and re-raise to prevent returning success
                 try:
                     if supabase_client:
-                        update_model_to_failed(model_id, str(e), supabase=supabase_client)
+                        await asyncio.to_thread(update_model_to_failed, model_id, str(e), supabase=supabase_client)
 
                         # Send MQTT failure notification
                         if MQTT_AVAILABLE and user_id:
@@ -418,12 +460,14 @@ async def _complete_image_to_3d(
 
         return result
 
-    except Exception as e:
+    except (Exception, asyncio.CancelledError) as e:
+        # 취소(DELETE)도 실패로 기록/알림한 뒤 다시 전파 (DB 레코드가 processing 으로 남지 않도록)
+        error_message = "Cancelled by user" if isinstance(e, asyncio.CancelledError) else str(e)
         # Update Supabase DB to failed if user_id provided
         if user_id and SUPABASE_AVAILABLE and supabase_client:
             try:
-                update_model_to_failed(model_id, str(e), supabase=supabase_client)
-                logger.error("[Supabase] DB record updated to failed: model_id=%s, error=%s", model_id, str(e))
+                await asyncio.to_thread(update_model_to_failed, model_id, error_message, supabase=supabase_client)
+                logger.error("[Supabase] DB record updated to failed: model_id=%s, error=%s", model_id, error_message)
 
                 # Send MQTT failure notification
                 if MQTT_AVAILABLE:
@@ -431,7 +475,7 @@ async def _complete_image_to_3d(
                         send_model_failure_notification(
                             user_id=user_id,
                             model_id=model_id,
-                            error_message=str(e),
+                            error_message=error_message,
                             generation_type="image_to_3d"
                         )
                     except Exception as mqtt_error:
@@ -468,7 +512,8 @@ async def _complete_text_to_3d_with_refine(
     if user_id and SUPABASE_AVAILABLE:
         try:
             supabase_client = get_supabase_client()
-            create_ai_model_record(
+            await asyncio.to_thread(
+                create_ai_model_record,
                 user_id=user_id,
                 model_id=model_id,
                 generation_type="text_to_3d",
@@ -539,47 +584,14 @@ async def _complete_text_to_3d_with_refine(
         # 6) Upload to Supabase Storage if user_id provided
         if user_id and SUPABASE_AVAILABLE and supabase_client:
             try:
-                glb_upload_result = None
-                stl_upload_result = None
-                thumbnail_upload_result = None
-
-                # Upload cleaned GLB (preferred) or original GLB
-                glb_to_upload = result.get("cleaned_glb_path") or result.get("local_path")
-                if glb_to_upload:
-                    glb_upload_result = upload_glb_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        glb_file_path=glb_to_upload,
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] GLB uploaded: %s", glb_upload_result.get("public_url"))
-                    result["supabase_glb_url"] = glb_upload_result.get("public_url")
-
-                # Upload STL if available
-                if result.get("stl_path"):
-                    stl_upload_result = upload_stl_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        stl_file_path=result["stl_path"],
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] STL uploaded: %s", stl_upload_result.get("public_url"))
-                    result["supabase_stl_url"] = stl_upload_result.get("public_url")
-
-                # Upload thumbnail if available
-                if result.get("thumbnail_path"):
-                    thumbnail_upload_result = upload_thumbnail_to_storage(
-                        user_id=user_id,
-                        model_id=model_id,
-                        thumbnail_file_path=result["thumbnail_path"],
-                        supabase=supabase_client
-                    )
-                    logger.info("[Supabase] Thumbnail uploaded: %s", thumbnail_upload_result.get("public_url"))
-                    result["supabase_thumbnail_url"] = thumbnail_upload_result.get("public_url")
+                glb_upload_result, stl_upload_result, thumbnail_upload_result = await _upload_model_files(
+                    result, user_id, model_id, supabase_client
+                )
 
                 # Update DB record to completed
                 if glb_upload_result:
-                    update_model_to_completed(
+                    await asyncio.to_thread(
+                        update_model_to_completed,
                         model_id=model_id,
                         storage_path=glb_upload_result.get("path"),
                         download_url=glb_upload_result.get("public_url"),
@@ -622,7 +634,7 @@ async def _complete_text_to_3d_with_refine(
                 # Update to failed status and re-raise to prevent returning success
                 try:
                     if supabase_client:
-                        update_model_to_failed(model_id, str(e), supabase=supabase_client)
+                        await asyncio.to_thread(update_model_to_failed, model_id, str(e), supabase=supabase_client)
 
                         # Send MQTT failure notification
                         if MQTT_AVAILABLE and user_id:
@@ -642,12 +654,14 @@ async def _complete_text_to_3d_with_refine(
 
         return result
 
-    except Exception as e:
+    except (Exception, asyncio.CancelledError) as e:
+        # 취소(DELETE)도 실패로 기록/알림한 뒤 다시 전파 (DB 레코드가 processing 으로 남지 않도록)
+        error_message = "Cancelled by user" if isinstance(e, asyncio.CancelledError) else str(e)
         # Update Supabase DB to failed if user_id provided
         if user_id and SUPABASE_AVAILABLE and supabase_client:
             try:
-                update_model_to_failed(model_id, str(e), supabase=supabase_client)
-                logger.error("[Supabase] DB record updated to failed: model_id=%s, error=%s", model_id, str(e))
+                await asyncio.to_thread(update_model_to_failed, model_id, error_message, supabase=supabase_client)
+                logger.error("[Supabase] DB record updated to failed: model_id=%s, error=%s", model_id, error_message)
 
                 # Send MQTT failure notification
                 if MQTT_AVAILABLE:
@@ -655,7 +669,7 @@ async def _complete_text_to_3d_with_refine(
                         send_model_failure_notification(
                             user_id=user_id,
                             model_id=model_id,
-                            error_message=str(e),
+                            error_message=error_message,
                             generation_type="text_to_3d"
                         )
                     except Exception as mqtt_error:
@@ -882,6 +896,14 @@ async def get_modelling_status(task_id: str) -> dict:
         endpoint_used,
     )
 
+    # 사용자가 취소한 작업은 상태 조회에서 다운로드/후처리를 다시 시작하지 않음
+    # (Meshy 상태는 그대로 두고, 로컬 처리 취소 여부만 별도 플래그로 표시)
+    from background_tasks import is_task_cancelled
+    cancelled_locally = is_task_cancelled(task_id)
+    if cancelled_locally:
+        data["cancelled_locally"] = True
+        logger.info("[MeshyStatus] id=%s was cancelled locally - skipping post-processing", task_id)
+
     # Check for local files (original GLB, cleaned GLB, STL) and trigger post-processing if needed
     if OUTPUT_DIR:
         from pathlib import Path
@@ -921,7 +943,7 @@ async def get_modelling_status(task_id: str) -> dict:
                 break
 
         # If task is SUCCEEDED but no local GLB, download it first
-        if data["status"] == "SUCCEEDED" and not model_glb and data["result_glb_url"]:
+        if data["status"] == "SUCCEEDED" and not cancelled_locally and not model_glb and data["result_glb_url"]:
             logger.info("[AutoDownload] Downloading GLB for task_id=%s", task_id)
             # Determine filename based on API version
             if endpoint_used == "v2":
@@ -942,6 +964,7 @@ async def get_modelling_status(task_id: str) -> dict:
 
         # If task is SUCCEEDED but no cleaned files, trigger post-processing
         if (data["status"] == "SUCCEEDED" and
+            not cancelled_locally and
             model_glb and
             not cleaned_glb.exists() and
             not stl_file.exists()):
@@ -27,6 +27,9 @@ load_dotenv(env_path, override=True)
 
 logger = logging.getLogger(__name__)
 
+# Video codecs in order of preference: H.264, else the original MPEG-4 Part 2
+_VIDEO_CODECS = ("avc1", "mp4v")
+
 
 class StorageUploader:
     """
@@ -157,7 +160,7 @@ class StorageUploader:
                 else:
                     public_url = ""
 
-            logger.info(f"[Storage] Uploaded {file_type} frame: {file_path}")
+            logger.info("[Storage] Uploaded %s frame: %s", file_type, file_path)
 
             return {
                 "path": file_path,
@@ -165,12 +168,12 @@ class StorageUploader:
             }
 
         except Exception as e:
-            logger.error(f"[Storage] Failed to upload frame: {e}")
+            logger.error("[Storage] Failed to upload frame: %s", e)
             raise
 
     async def upload_video_clip(
         self,
-        frames: list,
+        frames,
         user_id: str,
         device_uuid: str,
         file_type: str = "before",
@@ -180,7 +183,8 @@ class StorageUploader:
         Upload video clip from frame list to failure-videos bucket.
 
         Args:
-            frames: List of BGR images (numpy arrays)
+            frames: List of BGR images (numpy arrays), or one contiguous
+                (N, H, W, 3) uint8 array such as a preallocated ring buffer slice
             user_id: User UUID
             device_uuid: Device UUID
             file_type: 'before' or 'after'
@@ -189,7 +193,7 @@ class StorageUploader:
         Returns:
             Dictionary with path and public_url
         """
-        if not frames:
+        if len(frames) == 0:  # len(), not truthiness - also valid for an ndarray batch
             raise ValueError("No frames provided for video clip")
 
         try:
@@ -200,9 +204,14 @@ class StorageUploader:
             temp_path = f"./temp_{file_type}.mp4"
             height, width = frames[0].shape[:2]
 
-            # Use H.264 codec for wide compatibility
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(temp_path, fourcc, fps, (width, height))
+            # H.264 when the OpenCV build can encode it, mp4v otherwise
+            for codec in _VIDEO_CODECS:
+                out = cv2.VideoWriter(temp_path, cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+                if out.isOpened():
+                    break
+                out.release()
+            else:
+                raise RuntimeError(f"No usable video encoder for {temp_path}")
 
             for frame in frames:
                 out.write(frame)
@@ -230,7 +239,7 @@ class StorageUploader:
             # Cleanup temp file
             os.remove(temp_path)
 
-            logger.info(f"[Storage] Uploaded {file_type} video: {file_path} ({len(frames)} frames)")
+            logger.info("[Storage] Uploaded %s video: %s (%d frames)", file_type, file_path, len(frames))
 
             return {
                 "path": file_path,
@@ -238,7 +247,7 @@ class StorageUploader:
             }
 
         except Exception as e:
-            logger.error(f"[Storage] Failed to upload video clip: {e}")
+            logger.error("[Storage] Failed to upload video clip: %s", e)
             # Cleanup on error
             if os.path.exists(temp_path):
                 os.remove(temp_path)
@@ -281,7 +290,7 @@ class StorageUploader:
             # Get public URL
             public_url = self.client.storage.from_("failure-masks").get_public_url(file_path)
 
-            logger.info(f"[Storage] Uploaded mask: {file_path}")
+            logger.info("[Storage] Uploaded mask: %s", file_path)
 
             return {
                 "path": file_path,
@@ -289,7 +298,7 @@ class StorageUploader:
             }
 
         except Exception as e:
-            logger.error(f"[Storage] Failed to upload mask: {e}")
+            logger.error("[Storage] Failed to upload mask: %s", e)
             raise
 
     async def delete_file(self, bucket: str, file_path: str) -> bool:
@@ -305,11 +314,11 @@ class StorageUploader:
         """
         try:
             self.client.storage.from_(bucket).remove([file_path])
-            logger.info(f"[Storage] Deleted {bucket}/{file_path}")
+            logger.info("[Storage] Deleted %s/%s", bucket, file_path)
             return True
 
         except Exception as e:
-            logger.error(f"[Storage] Failed to delete file: {e}")
+            logger.error("[Storage] Failed to delete file: %s", e)
             return False
 
 
@@ -0,0 +1,204 @@
+"""background_tasks 취소/대기 테스트 (pytest test_background_tasks.py)"""
+import asyncio
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import background_tasks as bt
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    bt._background_tasks.clear()
+    bt._cancelled_tasks.clear()
+    yield
+    bt._background_tasks.clear()
+    bt._cancelled_tasks.clear()
+
+
+@pytest.fixture
+def fake_completion(monkeypatch):
+    """modelling_api._complete_image_to_3d 대신 취소될 때까지 대기하는 코루틴 (취소 시 기록)."""
+    events = []
+
+    async def _complete_image_to_3d(task_id, **kwargs):
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            events.append(("cancelled", task_id))
+            raise
+
+    monkeypatch.setitem(
+        sys.modules, "modelling_api",
+        types.SimpleNamespace(_complete_image_to_3d=_complete_image_to_3d),
+    )
+    return events
+
+
+def test_cancel_unknown_task_returns_false():
+    assert bt.cancel_background_task("missing") is False
+    assert not bt.is_task_cancelled("missing")
+
+
+def test_cancel_running_task(fake_completion):
+    async def scenario():
+        task = bt.start_background_task(
+            "t1", bt.process_image_to_3d_background("t1", "endpoint")
+        )
+        await asyncio.sleep(0)
+        assert bt.is_task_running("t1")
+
+        assert bt.cancel_background_task("t1") is True
+        # 취소 중 재요청은 다시 cancel() 하지 않고 성공으로 응답
+        assert bt.cancel_background_task("t1") is True
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert fake_completion == [("cancelled", "t1")]
+        assert bt.is_task_cancelled("t1")
+        assert "t1" not in bt._background_tasks
+        assert bt.cancel_background_task("t1") is False
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_completion_marks_db_failed_and_notifies(monkeypatch):
+    modelling_api = pytest.importorskip("modelling_api")
+    calls = []
+
+    async def never_done(endpoint, task_id):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(modelling_api, "poll_until_done", never_done)
+    monkeypatch.setattr(modelling_api, "SUPABASE_AVAILABLE", True)
+    monkeypatch.setattr(modelling_api, "MQTT_AVAILABLE", True)
+    monkeypatch.setattr(modelling_api, "get_supabase_client", lambda: object(), raising=False)
+    monkeypatch.setattr(
+        modelling_api, "create_ai_model_record", lambda **kwargs: calls.append("created"), raising=False
+    )
+    monkeypatch.setattr(
+        modelling_api, "update_model_to_failed",
+        lambda model_id, error, supabase=None: calls.append(("failed", error)), raising=False,
+    )
+    monkeypatch.setattr(
+        modelling_api, "send_model_failure_notification",
+        lambda **kwargs: calls.append(("mqtt", kwargs["error_message"])), raising=False,
+    )
+
+    async def scenario():
+        task = asyncio.create_task(modelling_api._complete_image_to_3d("t2", "endpoint", user_id="u1"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert calls == ["created", ("failed", "Cancelled by user"), ("mqtt", "Cancelled by user")]
+
+
+def test_cancel_records_expire():
+    bt._cancelled_tasks["old"] = time.monotonic() - bt.CANCELLED_TASK_TTL - 1
+    assert not bt.is_task_cancelled("old")
+
+    async def scenario():
+        bt.start_background_task("new", asyncio.sleep(3600))
+        await asyncio.sleep(0)
+        assert bt.cancel_background_task("new") is True
+
+    asyncio.run(scenario())
+    # 새 취소 기록 시 만료된 항목은 정리됨
+    assert set(bt._cancelled_tasks) == {"new"}
+    assert bt.is_task_cancelled("new")
+
+
+def test_wait_for_unknown_task_returns_immediately():
+    assert asyncio.run(bt.wait_for_background_task("missing", timeout=10)) is True
+
+
+def test_wait_for_task_returns_when_done_or_times_out():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+
+        task = bt.start_background_task("t4", work())
+        assert await bt.wait_for_background_task("t4", timeout=0.05) is False
+        assert not task.done()  # 대기 시간 초과는 작업을 취소하지 않음
+
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        assert await bt.wait_for_background_task("t4", timeout=5) is True
+        assert task.done()
+
+    asyncio.run(scenario())
+
+
+# ========== Endpoints ==========
+
+@pytest.fixture
+def client(monkeypatch):
+    pytest.importorskip("fastapi")
+    main = pytest.importorskip("main")
+    from fastapi.testclient import TestClient
+
+    async def fake_status(task_id):
+        return {"status": "SUCCEEDED", "progress": 100, "cancelled_locally": bt.is_task_cancelled(task_id)}
+
+    monkeypatch.setattr(main, "get_modelling_status", fake_status)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_cancel_endpoint_unknown_task_is_404(client):
+    assert client.delete("/v1/process/modelling/missing").status_code == 404
+
+
+def test_cancel_endpoint_cancels_running_task(client, fake_completion):
+    async def start():
+        bt.start_background_task("t3", bt.process_image_to_3d_background("t3", "endpoint"))
+
+    client.portal.call(start)
+    resp = client.delete("/v1/process/modelling/t3")
+    assert resp.status_code == 200
+    assert resp.json()["data"] == {"task_id": "t3", "cancelled": True}
+
+    resp = client.get("/v1/process/modelling/t3", params={"wait": 1})
+    # Meshy 상태는 그대로, 로컬 취소는 별도 플래그로
+    assert resp.json()["data"]["status"] == "SUCCEEDED"
+    assert resp.json()["data"]["cancelled_locally"] is True
+    assert fake_completion == [("cancelled", "t3")]
+
+
+def test_status_long_poll_returns_when_task_finishes(client):
+    async def start():
+        bt.start_background_task("t5", asyncio.sleep(0.2))
+
+    client.portal.call(start)
+    started = time.monotonic()
+    resp = client.get("/v1/process/modelling/t5", params={"wait": 10})
+    elapsed = time.monotonic() - started
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["status"] == "SUCCEEDED"
+    assert 0.15 <= elapsed < 5
+
+
+def test_status_long_poll_is_capped(client, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "MODELLING_STATUS_MAX_WAIT", 0.1)
+
+    async def start():
+        bt.start_background_task("t6", asyncio.sleep(3600))
+
+    client.portal.call(start)
+    started = time.monotonic()
+    resp = client.get("/v1/process/modelling/t6", params={"wait": 30})
+
+    assert resp.status_code == 200
+    assert time.monotonic() - started < 5
+    assert bt.is_task_running("t6")
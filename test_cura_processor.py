@@ -0,0 +1,338 @@
+"""cura_processor 테스트 (pytest test_cura_processor.py)
+
+CuraEngine 대신 -o 파일에 설정값을 그대로 기록하는 스텁 실행 파일을 사용합니다.
+"""
+import asyncio
+import math
+import os
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cura_processor as cp
+
+
+# ========== G1 stats (vectorised parser) ==========
+
+_F_RE = re.compile(r'F([\d.]+)')
+_E_RE = re.compile(r'E([\d.\-]+)')
+_X_RE = re.compile(r'X([\d.\-]+)')
+_Y_RE = re.compile(r'Y([\d.\-]+)')
+_Z_RE = re.compile(r'Z([\d.\-]+)')
+
+
+def _reference_g1_stats(path):
+    """기존 줄 단위 정규식 루프 (벡터화 이전 구현) - 시간(초), 최대 E."""
+    total_time_seconds = 0.0
+    max_e_value = 0.0
+    current_feedrate = 0.0
+    last_x, last_y, last_z = 0.0, 0.0, 0.0
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith('G1 '):
+                continue
+            f_match = _F_RE.search(line)
+            if f_match:
+                current_feedrate = float(f_match.group(1))
+            e_match = _E_RE.search(line)
+            if e_match:
+                max_e_value = max(max_e_value, float(e_match.group(1)))
+            x_match = _X_RE.search(line)
+            y_match = _Y_RE.search(line)
+            z_match = _Z_RE.search(line)
+            x = float(x_match.group(1)) if x_match else last_x
+            y = float(y_match.group(1)) if y_match else last_y
+            z = float(z_match.group(1)) if z_match else last_z
+            distance = math.sqrt((x - last_x) ** 2 + (y - last_y) ** 2 + (z - last_z) ** 2)
+            if current_feedrate > 0 and distance > 0:
+                total_time_seconds += distance / current_feedrate * 60
+            last_x, last_y, last_z = x, y, z
+    return total_time_seconds, max_e_value
+
+
+def _write_random_gcode(path, moves=5000, seed=1234):
+    """슬라이서 출력과 비슷한 G-code: 레이어, 리트랙션, 주석, G0/M 명령 혼합."""
+    rng = random.Random(seed)
+    lines = [";FLAVOR:Marlin", ";TIME:6666", "M104 S205", "G28", "G92 E0", "G1 F2700 E-5"]
+    e = 0.0
+    z = 0.0
+    for i in range(moves):
+        if i % 250 == 0:
+            z = round(z + 0.2, 3)
+            lines.append(f";LAYER:{i // 250}")
+            lines.append(f"G0 F9000 X{rng.uniform(0, 220):.3f} Y{rng.uniform(0, 220):.3f} Z{z}")
+            lines.append(f"G1 Z{z}")
+        kind = rng.random()
+        x, y = rng.uniform(0, 220), rng.uniform(0, 220)
+        if kind < 0.05:
+            lines.append(f"G1 F2700 E{e - 0.8:.5f} ; retract")
+        elif kind < 0.15:
+            lines.append(f"G1 F{rng.choice((1200, 1500, 1800))} X{x:.3f} Y{y:.3f}")
+        elif kind < 0.2:
+            lines.append(f"M106 S{rng.randint(0, 255)}")
+        else:
+            e += rng.uniform(0.01, 1.5)
+            lines.append(f"G1 X{x:.3f} Y{y:.3f} E{e:.5f}")
+    lines.append(";End of Gcode")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _reference_g1_columns(text):
+    """줄 단위 정규식으로 뽑은 G1 의 F/E/X/Y/Z 값 (없으면 NaN) - _g1_word_columns 기대값."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('G1 '):
+            continue
+        row = []
+        for regex in (_F_RE, _E_RE, _X_RE, _Y_RE, _Z_RE):
+            match = regex.search(line)
+            row.append(float(match.group(1)) if match else math.nan)
+        rows.append(row)
+    return cp.np.array(rows, dtype=float).reshape(-1, 5).T
+
+
+def test_g1_columns_match_regex_exactly(tmp_path):
+    gcode = tmp_path / "random.gcode"
+    _write_random_gcode(gcode)
+    text = gcode.read_text()
+
+    columns = cp._g1_word_columns(text.encode())
+    cp.np.testing.assert_array_equal(columns, _reference_g1_columns(text))
+
+
+ODD_NUMBER_LINES = [
+    "G1 X12345678901234567890 Y1",      # int64 가수 범위를 넘는 자릿수
+    "G1 X0.00000000000000000123 Y2",    # 15자리 초과 소수
+    "G1 X123456789012345.6 Y3",         # 16자리
+    "G1 F12-3 X.5 Y-.25 Z5.",           # F 는 '-' 앞에서 끝남, 선행/후행 소수점
+    "G1 X007 Y-0 E1e5",                 # 선행 0, 음수 0, 지수 표기는 E 값 '1' 로 끊김
+    "G1 X1 X2 Y3 ; X4 comment",         # 같은 줄에서 처음 나온 값
+]
+
+
+def test_g1_columns_odd_numbers_match_float():
+    text = "\n".join(ODD_NUMBER_LINES) + "\n"
+    columns = cp._g1_word_columns(text.encode())
+    cp.np.testing.assert_array_equal(columns, _reference_g1_columns(text))
+
+
+def test_g1_stats_malformed_number_returns_none(tmp_path):
+    # float() 가 거부하는 값은 예전처럼 통계 계산 실패(None)로 처리
+    gcode = tmp_path / "bad.gcode"
+    gcode.write_text("G1 F1200 X10 Y10 E1\nG1 X1-2 Y3 E2\n")
+    assert cp._calculate_gcode_stats(str(gcode))['calculated_time_seconds'] is None
+
+
+@pytest.mark.parametrize("scan_chunk", [cp.CURA_GCODE_SCAN_CHUNK, 4096])
+def test_g1_stats_match_per_line_loop(tmp_path, monkeypatch, scan_chunk):
+    # 작은 청크로도 실행해 줄/청크 경계 처리(feedrate, 좌표 이월)를 확인
+    monkeypatch.setattr(cp, "CURA_GCODE_SCAN_CHUNK", scan_chunk)
+    gcode = tmp_path / "random.gcode"
+    _write_random_gcode(gcode)
+
+    expected_time, expected_e = _reference_g1_stats(gcode)
+    stats = cp._calculate_gcode_stats(str(gcode))
+
+    assert abs(stats['calculated_time_seconds'] - expected_time) <= 1
+    assert stats['calculated_filament_mm'] == round(expected_e, 2)
+    assert stats['calculated_filament_m'] == round(expected_e / 1000.0, 2)
+
+
+def test_move_time_kernels_agree():
+    rng = random.Random(7)
+    n = 1000
+    cols = [cp.np.array([rng.uniform(0, 200) for _ in range(n)]) for _ in range(3)]
+    feed = cp.np.array([rng.choice((0.0, 1200.0, 3000.0)) for _ in range(n)])
+    args = (*cols, feed, 1.0, 2.0, 0.2)
+
+    expected = cp._integrate_move_time_loop(*args)
+    assert cp._integrate_move_time_numpy(*args) == pytest.approx(expected)
+    assert cp._integrate_move_time(*args) == pytest.approx(expected)
+
+
+# ========== Slice cache ==========
+
+STUB_ENGINE = """\
+#!{python}
+# CuraEngine 스텁: 실제 엔진처럼 -o 파일을 제자리에서 다시 쓰고, 호출 횟수를 기록
+import sys
+args = sys.argv
+settings = [args[i + 1] for i, a in enumerate(args) if a == "-s"]
+with open(args[args.index("-o") + 1], "w") as f:
+    f.write(";SETTINGS:" + ",".join(settings) + "\\n")
+    f.write("G1 F1200 X10 Y10 E1.5\\n")
+with open({calls!r}, "a") as f:
+    f.write("slice\\n")
+"""
+
+
+@pytest.fixture
+def cura(tmp_path, monkeypatch):
+    """Stub CuraEngine + definition with OUTPUT_DIR and the slice cache under tmp_path."""
+    if os.name == "nt":
+        pytest.skip("stub engine relies on a shebang script")
+
+    calls = tmp_path / "calls.txt"
+    engine = tmp_path / "CuraEngine"
+    engine.write_text(STUB_ENGINE.format(python=sys.executable, calls=str(calls)))
+    engine.chmod(0o755)
+    definitions = tmp_path / "definitions"
+    definitions.mkdir()
+    definition = definitions / "printer.def.json"
+    definition.write_text(
+        '{"version": 2, "name": "stub", "inherits": "fdmprinter",'
+        ' "metadata": {"machine_extruder_trains": {"0": "stub_extruder_0"}}}'
+    )
+    (definitions / "fdmprinter.def.json").write_text('{"version": 2, "name": "FFF", "settings": {}}')
+    (definitions / "stub_extruder_0.def.json").write_text(
+        '{"version": 2, "name": "Extruder 1", "inherits": "fdmextruder", "overrides": {}}'
+    )
+    (definitions / "fdmextruder.def.json").write_text('{"version": 2, "name": "Extruder", "settings": {}}')
+    stl = tmp_path / "model.stl"
+    stl.write_bytes(b"solid stub\nendsolid stub\n")
+    out = tmp_path / "out"
+    out.mkdir()
+
+    monkeypatch.setattr(cp, "CURAENGINE_PATH", str(engine))
+    monkeypatch.setattr(cp, "_CURAENGINE_ABS", str(engine))
+    monkeypatch.setattr(cp, "OUTPUT_DIR", out)
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_DIR", out / "slice_cache")
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_MAX", 200)
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_SLACK", 0)
+    monkeypatch.setattr(cp, "_slice_cache_count", None)
+    cp.reset_cura_availability_cache()
+    yield {
+        "engine": engine,
+        "definitions": definitions,
+        "stl": stl,
+        "definition": str(definition),
+        "out": out,
+        "slices": lambda: len(calls.read_text().splitlines()) if calls.exists() else 0,
+    }
+    cp.reset_cura_availability_cache()
+
+
+def _slice(cura, name, layer_height):
+    gcode = cura["out"] / name
+    ok, _ = asyncio.run(cp.run_curaengine_process(
+        cura["stl"], gcode, {"layer_height": layer_height}, cura["definition"],
+    ))
+    assert ok
+    return gcode.read_text()
+
+
+def test_slice_cache_hit_and_miss(cura):
+    first = _slice(cura, "a.gcode", "0.2")
+    assert cura["slices"]() == 1
+
+    # 같은 STL + 설정 -> 엔진을 다시 실행하지 않음
+    assert _slice(cura, "b.gcode", "0.2") == first
+    assert cura["slices"]() == 1
+
+    # 설정이 다르면 새로 슬라이싱
+    assert "layer_height=0.3" in _slice(cura, "c.gcode", "0.3")
+    assert cura["slices"]() == 2
+
+
+def test_reslice_same_output_keeps_cache_intact(cura):
+    # A -> B -> A 를 같은 출력 경로로: 캐시 항목이 B 의 결과로 덮이면 안 됨
+    a = _slice(cura, "model.gcode", "0.2")
+    b = _slice(cura, "model.gcode", "0.3")
+    assert "layer_height=0.2" in a and "layer_height=0.3" in b
+
+    assert _slice(cura, "model.gcode", "0.2") == a
+    assert _slice(cura, "model.gcode", "0.3") == b
+    assert cura["slices"]() == 2
+    assert not list(cura["out"].glob("*.part"))
+
+
+def test_slice_cache_evicts_least_recently_used(cura, monkeypatch):
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_MAX", 2)
+    cache_dir = cura["out"] / "slice_cache"
+
+    _slice(cura, "a.gcode", "0.1")
+    entry_a = set(os.listdir(cache_dir))
+    _slice(cura, "b.gcode", "0.2")
+    # a 를 다시 사용해 최근 항목으로 만든 뒤 세 번째 설정 추가 -> b 가 제거됨
+    _slice(cura, "a2.gcode", "0.1")
+    _slice(cura, "c.gcode", "0.3")
+
+    entries = set(os.listdir(cache_dir))
+    assert len(entries) == 2
+    assert entry_a <= entries
+    assert cura["slices"]() == 3
+
+    _slice(cura, "b2.gcode", "0.2")
+    assert cura["slices"]() == 4
+
+
+def test_slice_cache_evicts_only_past_slack(cura, monkeypatch):
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_MAX", 2)
+    monkeypatch.setattr(cp, "CURA_SLICE_CACHE_SLACK", 2)
+    cache_dir = cura["out"] / "slice_cache"
+
+    for i in range(4):
+        _slice(cura, f"s{i}.gcode", f"0.{i + 1}")
+    assert len(os.listdir(cache_dir)) == 4  # 한도 + 여유분 이내: 스캔/삭제 없음
+
+    _slice(cura, "s4.gcode", "0.5")
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def _bump(path):
+    """파일 내용/mtime 변경 (제자리 업그레이드/정의 수정 흉내)."""
+    path.write_bytes(path.read_bytes() + b"\n")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.mark.parametrize("changed", ["engine", "fdmprinter", "stub_extruder_0", "fdmextruder"])
+def test_slice_cache_key_covers_engine_and_definition_chain(cura, changed):
+    _slice(cura, "a.gcode", "0.2")
+    _slice(cura, "b.gcode", "0.2")
+    assert cura["slices"]() == 1
+
+    target = cura["engine"] if changed == "engine" else cura["definitions"] / f"{changed}.def.json"
+    _bump(target)
+    cp.reset_cura_availability_cache()
+    _slice(cura, "c.gcode", "0.2")
+    assert cura["slices"]() == 2
+
+
+def test_settings_shadowed_by_extruder_chain_are_kept(cura):
+    definitions = cura["definitions"]
+    (definitions / "printer.def.json").write_text(
+        '{"version": 2, "name": "stub", "inherits": "fdmprinter",'
+        ' "metadata": {"machine_extruder_trains": {"0": "stub_extruder_0"}},'
+        ' "overrides": {"speed_print": {"default_value": 60},'
+        ' "material_diameter": {"default_value": 1.75},'
+        ' "machine_nozzle_size": {"default_value": 0.4}}}'
+    )
+    (definitions / "stub_extruder_0.def.json").write_text(
+        '{"version": 2, "name": "Extruder 1", "inherits": "fdmextruder",'
+        ' "overrides": {"material_diameter": {"default_value": 2.85}}}'
+    )
+    (definitions / "fdmextruder.def.json").write_text(
+        '{"version": 2, "name": "Extruder", "settings": {"machine_settings": {"children":'
+        ' {"machine_nozzle_size": {"default_value": 0.4}}}}}'
+    )
+    cp.reset_cura_availability_cache()
+
+    gcode = cura["out"] / "shadowed.gcode"
+    ok, _ = asyncio.run(cp.run_curaengine_process(
+        cura["stl"], gcode,
+        {"speed_print": "60", "material_diameter": "1.75", "machine_nozzle_size": "0.4"},
+        cura["definition"],
+    ))
+    assert ok
+    text = gcode.read_text()
+    # -s 는 -e0 뒤(익스트루더 범위)에 적용: 익스트루더 체인이 정의한 키는 전달해야 함
+    assert "material_diameter=1.75" in text
+    assert "machine_nozzle_size=0.4" in text
+    assert "speed_print=" not in text
@@ -17,6 +17,9 @@ if OUTPUT_DIR:
 DEFAULT_MODEL_SIZE_MM = float(os.getenv("DEFAULT_MODEL_SIZE_MM", "100.0"))
 MIN_MODEL_X_MM = float(os.getenv("MIN_MODEL_X_MM", "10.0"))
 
+# ---- DOWNLOAD -----------------------------------------------------
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # GLB/STL 다운로드 시 한 번에 쓰는 크기 (write syscall 수 감소)
+
 
 # ---- HTTP Client --------------------------------------------------
 def get_httpx_client() -> httpx.AsyncClient:
@@ -71,7 +74,7 @@ async def download_file(url: str, out_path: Path) -> Path:
         async with client.stream("GET", url, timeout=180) as resp:
             resp.raise_for_status()
             with open(out_path, "wb") as f:
-                async for chunk in resp.aiter_bytes():
+                async for chunk in resp.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
     return out_path
 